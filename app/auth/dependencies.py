@@ -5,7 +5,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models.user import User
+from app.models.user import USER_BY_ID, User
 from app.schemas.user import UserResponse
 
 # Tests expect no leading slash
@@ -29,7 +29,7 @@ def get_current_user(
         raise credentials_exception
 
     # Query the user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.scalar(USER_BY_ID, {"user_id": user_id})
     if not user:
         raise credentials_exception
 
@@ -1,19 +1,64 @@
+import itertools
+import math
+import time
+
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 from app.config import settings
+from app.database_pool import (
+    MeteredAsyncQueuePool,
+    MeteredQueuePool,
+    instrument_pool,
+    pool_options,
+)
+from app.database_queries import instrument_engine
+from app.database_sqlite import (
+    apply_sqlite_pragmas,
+    is_memory_database,
+    is_sqlite,
+    sqlite_engine_options,
+)
 
 # ---------------------------------------------------------
 # Global Base for all models
 # ---------------------------------------------------------
 Base = declarative_base()
 
+# ---------------------------------------------------------
+# Pool / driver arguments shared by the sync and async engines
+# ---------------------------------------------------------
+def engine_options(database_url: str, poolclass) -> dict:
+    if not is_sqlite(database_url):
+        return {"poolclass": poolclass, **pool_options()}
+    options = sqlite_engine_options(database_url)
+    if "poolclass" not in options:
+        options.update(poolclass=poolclass, **pool_options())
+    return options
+
+
+def instrument(engine, database_url: str) -> None:
+    """Pool metrics, query stats and (SQLite) pragmas for a sync Engine."""
+    instrument_pool(engine.pool)
+    instrument_engine(engine)
+    if is_sqlite(database_url):
+        apply_sqlite_pragmas(engine)
+
+
 # ---------------------------------------------------------
 # Create engine from DATABASE_URL in config.py
 # ---------------------------------------------------------
 def get_engine(database_url: str = settings.DATABASE_URL):
     try:
-        engine = create_engine(database_url, echo=True)
+        engine = create_engine(
+            database_url,
+            echo=settings.DB_ECHO,
+            **engine_options(database_url, MeteredQueuePool),
+        )
+        instrument(engine, database_url)
         return engine
     except SQLAlchemyError as e:
         print(f"Error creating engine: {e}")
@@ -42,3 +87,114 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------------------------
+# Async engine + session (asyncpg) for the async routers
+# ---------------------------------------------------------
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """Same database through its async driver (postgresql:// -> postgresql+asyncpg://)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine(database_url: str = settings.DATABASE_URL):
+    if is_sqlite(database_url) and is_memory_database(database_url):
+        # Its StaticPool connection would be a second, empty database next to
+        # the sync engine's, so migrations and sync writes would be invisible.
+        raise ValueError(
+            "In-memory SQLite is not supported for the app; use a file URL "
+            "such as sqlite:///./app.db"
+        )
+    try:
+        engine = create_async_engine(
+            async_database_url(database_url),
+            echo=settings.DB_ECHO,
+            **engine_options(database_url, MeteredAsyncQueuePool),
+        )
+        instrument(engine.sync_engine, database_url)
+        return engine
+    except SQLAlchemyError as e:
+        print(f"Error creating async engine: {e}")
+        raise
+
+
+def get_async_sessionmaker(engine):
+    # Rows stay readable after commit without a lazy (blocking) refresh.
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async_engine = get_async_engine()
+AsyncSessionLocal = get_async_sessionmaker(async_engine)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ---------------------------------------------------------
+# Read replicas with read-your-writes
+#
+# GET routes read through get_read_db, which picks a replica (round-robin)
+# unless the client wrote recently: get_write_db (or pin_to_primary, for
+# routes that write through the sync session) sets a short-lived cookie
+# holding the time until which that client's reads stay on the primary.
+# ---------------------------------------------------------
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+replica_engines = [get_async_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+ReplicaSessionLocals = [get_async_sessionmaker(e) for e in replica_engines]
+_next_replica = itertools.count()
+
+
+def pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_sessionmaker(request: Request):
+    if not ReplicaSessionLocals or pinned_to_primary(request):
+        return AsyncSessionLocal
+    return ReplicaSessionLocals[next(_next_replica) % len(ReplicaSessionLocals)]
+
+
+async def get_read_db(request: Request):
+    async with read_sessionmaker(request)() as db:
+        yield db
+
+
+def pin_to_primary(response: Response) -> None:
+    """Keep this client's reads on the primary for READ_YOUR_WRITES_SECONDS."""
+    if ReplicaSessionLocals:
+        window = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE,
+            f"{time.time() + window:.3f}",
+            max_age=max(1, math.ceil(window)),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+async def get_write_db(response: Response):
+    # Set up front: code after the yield runs too late to add headers.
+    pin_to_primary(response)
+    async with AsyncSessionLocal() as db:
+        yield db
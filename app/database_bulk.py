@@ -0,0 +1,40 @@
+"""
+Fast multi-row inserts for the async session.
+
+On Postgres (asyncpg) rows go through binary COPY on the session's own
+connection, so they are part of its transaction and roll back with it. The
+asyncpg adapter only opens that transaction when a statement goes through it,
+and COPY goes straight to the driver, so a statement is issued first. Other
+backends use one Core executemany, which SQLAlchemy batches (insertmanyvalues
+where the driver benefits from it).
+
+Rows are plain tuples in ``columns`` order and must carry every value,
+including what the model would default in Python (ids, timestamps): neither
+path goes through the ORM.
+"""
+
+from typing import Sequence
+
+from sqlalchemy import Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def bulk_insert(
+    db: AsyncSession,
+    table: Table,
+    columns: Sequence[str],
+    rows: Sequence[tuple],
+) -> None:
+    connection = await db.connection()
+    if connection.dialect.driver == "asyncpg":
+        # Otherwise a COPY that is the session's first statement autocommits.
+        await connection.execute(text("SELECT 1"))
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=rows, columns=list(columns), schema_name=table.schema,
+        )
+    else:
+        await connection.execute(
+            insert(table),
+            [dict(zip(columns, row)) for row in rows],
+        )
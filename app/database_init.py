@@ -1,12 +1,74 @@
-from app.database import engine, Base
+"""
+One-shot database setup, run once per deploy before the workers start:
+
+    python -m app.database_init migrate    # apply pending schema migrations
+    python -m app.database_init seed       # create the default test user (idempotent)
+    python -m app.database_init check      # exit non-zero if migrations are pending
+"""
+
+import argparse
+import logging
+import sys
+
+from app.database import engine, Base, SessionLocal
+from app.migrations import SCHEMA_VERSION, SchemaVersionError, check_schema_version, migrate
+from app.migrations import schema_version
 from app.models.user import User
 from app.models.calculation import Calculation
 
+logger = logging.getLogger(__name__)
+
+TEST_USER_EMAIL = "test@test.com"
+
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    return migrate(engine)
 
 def drop_db():
     Base.metadata.drop_all(bind=engine)
+    schema_version.drop(bind=engine, checkfirst=True)
+
+def seed_test_user() -> bool:
+    """Create the default Playwright test user unless it exists; True if created."""
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter(User.email == TEST_USER_EMAIL).first():
+            logger.info("Default test user already exists")
+            return False
+        user = User(
+            first_name="Test",
+            last_name="User",
+            email=TEST_USER_EMAIL,
+            username=TEST_USER_EMAIL,
+        )
+        user.password = "password"
+        db.add(user)
+        db.commit()
+        logger.info("Seeded default Playwright test user")
+        return True
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.database_init")
+    parser.add_argument("command", choices=["migrate", "seed", "check"], nargs="?", default="migrate")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        applied = init_db()
+        print(f"Applied migrations: {applied or 'none'}; schema version {SCHEMA_VERSION}")
+    elif args.command == "seed":
+        seed_test_user()
+    else:
+        try:
+            print(f"Schema version {check_schema_version(engine)}")
+        except SchemaVersionError as e:
+            print(e, file=sys.stderr)
+            return 1
+    return 0
+
 
 if __name__ == "__main__":
-    init_db()
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
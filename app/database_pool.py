@@ -0,0 +1,156 @@
+"""
+Connection pool sizing and live metrics for the sync and async engines.
+
+Every worker process owns one sync and one async engine, each with its own
+pool. With DB_MAX_CONNECTIONS set, that budget is split evenly across
+WEB_CONCURRENCY workers and both engines, so the whole deployment stays under
+the Postgres max_connections it was sized for.
+
+Metrics are collected with pool events (checkout, checkin, connect,
+invalidate); the time spent waiting for a connection is measured around
+Pool.connect(), which is where a checkout blocks when the pool is exhausted.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import settings
+
+# sync + async engine in every worker
+ENGINES_PER_WORKER = 2
+
+
+def pool_options(engines_per_worker: int = ENGINES_PER_WORKER) -> Dict[str, Any]:
+    """create_engine() pool arguments for one engine of one worker."""
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS:
+        workers = max(1, settings.WEB_CONCURRENCY)
+        per_engine = max(1, settings.DB_MAX_CONNECTIONS // (workers * engines_per_worker))
+        pool_size = min(pool_size, per_engine)
+        max_overflow = per_engine - pool_size
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, pool: QueuePool) -> None:
+        # Listeners live on the pool's dispatch, which survives dispose()/recreate().
+        @event.listens_for(pool, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+                if pool.checkedout() > pool.size():
+                    self.overflow_checkouts += 1
+
+        @event.listens_for(pool, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+        @event.listens_for(pool, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(pool, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, int | float]:
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.checkouts, 3)
+                if self.checkouts else 0.0,
+            }
+
+
+class _MeteredPoolMixin:
+    metrics: PoolMetrics | None = None
+
+    def connect(self):
+        if self.metrics is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(pool: QueuePool) -> PoolMetrics | None:
+    if not isinstance(pool, QueuePool):
+        return None     # e.g. StaticPool for in-memory SQLite
+    metrics = PoolMetrics()
+    metrics.attach(pool)
+    if isinstance(pool, _MeteredPoolMixin):
+        pool.metrics = metrics
+    return metrics
+
+
+def pool_stats(pool: QueuePool) -> Dict[str, int | float | str]:
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+    metrics = getattr(pool, "metrics", None) or PoolMetrics()
+    return metrics.snapshot(pool)
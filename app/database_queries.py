@@ -0,0 +1,185 @@
+"""
+Query instrumentation for the sync and async engines (replaces echo=True).
+
+Every statement is timed with before/after_cursor_execute and reduced to a
+fingerprint: literals and bind placeholders become ``?``, IN-lists collapse
+to ``(?)`` and whitespace is normalized, so the same query with different
+values is counted once. Per fingerprint we keep the count, total time and a
+bounded window of recent timings for p50/p99.
+
+Only statements slower than SLOW_QUERY_MS are logged, with their bind
+parameters and the route of the request that issued them.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Deque, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger("app.slow_query")
+
+_MAX_LOGGED_PARAMS = 1000
+
+# ASGI scope of the request being served; routing fills in scope["route"].
+current_scope: ContextVar[dict | None] = ContextVar("current_scope", default=None)
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):(?!:)\w+|\?")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    text = _COMMENTS.sub(" ", statement)
+    text = _STRINGS.sub("?", text)
+    text = _PLACEHOLDERS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _IN_LISTS.sub("(?)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def current_route() -> str:
+    scope = current_scope.get()
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', 'WS')} {path}"
+
+
+class _FingerprintStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    # Nearest-rank on the retained window.
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QueryStats:
+    def __init__(self, max_fingerprints: int, window: int):
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _FingerprintStats] = {}
+        self.untracked = 0
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self.untracked += 1
+                    return
+                stats = self._stats[key] = _FingerprintStats(self.window)
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.samples.append(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.untracked = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = [
+                (key, stats.count, stats.total, stats.max, sorted(stats.samples))
+                for key, stats in self._stats.items()
+            ]
+            untracked = self.untracked
+
+        fingerprints = [
+            {
+                "fingerprint": key,
+                "count": count,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / count, 3),
+                "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+                "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+                "max_ms": round(longest * 1000, 3),
+            }
+            for key, count, total, longest, ordered in rows
+        ]
+        fingerprints.sort(key=lambda row: row["total_ms"], reverse=True)
+        return {
+            "slow_query_ms": settings.SLOW_QUERY_MS,
+            "untracked": untracked,
+            "fingerprints": fingerprints,
+        }
+
+
+query_stats = QueryStats(
+    max_fingerprints=settings.QUERY_STATS_MAX_FINGERPRINTS,
+    window=settings.QUERY_STATS_WINDOW,
+)
+
+
+def _log_slow_query(seconds: float, statement: str, parameters: Any) -> None:
+    params = repr(parameters)
+    if len(params) > _MAX_LOGGED_PARAMS:
+        params = params[:_MAX_LOGGED_PARAMS] + "..."
+    logger.warning(
+        "Slow query (%.1f ms) [%s]: %s | params=%s",
+        seconds * 1000, current_route(), statement, params,
+    )
+
+
+def instrument_engine(engine: Engine, stats: QueryStats = query_stats) -> None:
+    """Attach timing listeners (for an AsyncEngine pass ``engine.sync_engine``)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_start"].pop()
+        stats.record(statement, seconds)
+        if seconds * 1000 >= settings.SLOW_QUERY_MS:
+            _log_slow_query(seconds, statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute.
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+class QueryRouteMiddleware:
+    """Make the current request visible to the slow-query log."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
@@ -0,0 +1,59 @@
+"""
+SQLite backend for single-node installs and server-less test runs.
+
+File databases run in WAL mode, so readers never block the writer. Every new
+connection gets the same pragmas (synchronous, mmap_size, cache_size,
+busy_timeout, foreign_keys) through a connect listener. That covers both the
+sqlite3 (sync) and aiosqlite (async) engines. In-memory databases share one
+connection through StaticPool; otherwise each connection would see its own
+empty database. That only holds within one engine, so in-memory URLs are for
+standalone sync engines (tests, benchmarks): the app's async engine refuses
+them, since it would get a second, empty database.
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+
+
+def is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def is_memory_database(database_url: str) -> bool:
+    return make_url(database_url).database in (None, "", ":memory:")
+
+
+def sqlite_engine_options(database_url: str) -> Dict[str, Any]:
+    # Connections are used from the threadpool, not only the creating thread.
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if is_memory_database(database_url):
+        options["poolclass"] = StaticPool
+    return options
+
+
+def sqlite_pragmas() -> List[str]:
+    return [
+        f"journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "foreign_keys=ON",
+    ]
+
+
+def apply_sqlite_pragmas(engine: Engine) -> None:
+    """Per-connection setup (for an AsyncEngine pass ``engine.sync_engine``)."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
@@ -0,0 +1,9 @@
+from app.migrations.runner import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    SchemaVersionError,
+    check_schema_version,
+    current_version,
+    migrate,
+    schema_version,
+)
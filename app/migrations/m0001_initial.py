@@ -0,0 +1,56 @@
+"""Users and calculations, as previously created by Base.metadata.create_all."""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.engine import Connection
+
+from app.models.types import GUID
+
+VERSION = 1
+TRANSACTIONAL = True
+
+# Frozen copy of the schema at this version; later model changes get their
+# own migration instead of editing this one.
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", GUID(), primary_key=True),
+    Column("first_name", String(50), nullable=False),
+    Column("last_name", String(50), nullable=False),
+    Column("email", String(120), unique=True, nullable=False, index=True),
+    Column("username", String(50), unique=True, nullable=False, index=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("is_verified", Boolean, nullable=False),
+    Column("last_login", DateTime, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+calculations = Table(
+    "calculations",
+    metadata,
+    Column("id", GUID(), primary_key=True),
+    Column("operation", String(50), nullable=False),
+    Column("a", Float, nullable=False),
+    Column("b", Float, nullable=False),
+    Column("result", Float, nullable=False),
+    Column("user_id", GUID(), ForeignKey("users.id"), nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    # checkfirst adopts databases created by the old create_all at startup.
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,12 @@
+"""Composite (created_at, id) index for keyset pagination of calculations."""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+VERSION = 2
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection) -> None:
+    ops.create_index(connection, "ix_calculations_created_at_id", "calculations", ["created_at", "id"])
@@ -0,0 +1,23 @@
+"""Indexes behind the browse/export filters (operation, user_id, a, b, result)."""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations import ops
+
+VERSION = 3
+TRANSACTIONAL = False
+
+INDEXES = [
+    # Equality filters lead, followed by the page order, so a filtered page
+    # is a range scan that needs no sort.
+    ("ix_calculations_operation_created_at_id", ["operation", "created_at", "id"]),
+    ("ix_calculations_user_id_created_at_id", ["user_id", "created_at", "id"]),
+    ("ix_calculations_a", ["a"]),
+    ("ix_calculations_b", ["b"]),
+    ("ix_calculations_result", ["result"]),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for name, columns in INDEXES:
+        ops.create_index(connection, name, "calculations", columns)
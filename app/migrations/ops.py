@@ -0,0 +1,42 @@
+"""
+Helpers for migration steps that must behave the same on Postgres and SQLite.
+"""
+
+from typing import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def create_index(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+) -> None:
+    """
+    Build an index without blocking writes on Postgres (CONCURRENTLY).
+
+    CONCURRENTLY cannot run inside a transaction, so migrations using this
+    must be declared with ``transactional=False``. A failed concurrent build
+    leaves an INVALID index behind that IF NOT EXISTS would silently keep, so
+    an invalid index of the same name is dropped and rebuilt; a valid one is
+    left alone, which makes a retried migration safe.
+    """
+    postgres = connection.dialect.name == "postgresql"
+    if postgres and connection.scalar(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ):
+        drop_index(connection, name)
+    concurrently = " CONCURRENTLY" if postgres else ""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    connection.execute(text(
+        f"CREATE {kind}{concurrently} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    ))
+
+
+def drop_index(connection: Connection, name: str) -> None:
+    concurrently = " CONCURRENTLY" if connection.dialect.name == "postgresql" else ""
+    connection.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
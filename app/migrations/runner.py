@@ -0,0 +1,140 @@
+"""
+Versioned schema migrations.
+
+Each migration module defines VERSION, TRANSACTIONAL and upgrade(connection).
+Every step runs on the one connection that holds the lock, which is normally
+in autocommit mode (Postgres needs that for CREATE INDEX CONCURRENTLY).
+Transactional migrations switch it back to the default isolation level and
+run in one transaction together with their schema_version row;
+non-transactional ones must be idempotent. On Postgres an advisory lock
+serializes concurrent ``migrate`` runs.
+
+Workers never migrate: at startup they only compare the recorded version
+with SCHEMA_VERSION (check_schema_version), which is a single query.
+"""
+
+import logging
+from datetime import datetime
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.migrations import (
+    m0001_initial,
+    m0002_calculations_created_at_index,
+    m0003_calculations_filter_indexes,
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS: List[ModuleType] = [
+    m0001_initial,
+    m0002_calculations_created_at_index,
+    m0003_calculations_filter_indexes,
+]
+SCHEMA_VERSION = MIGRATIONS[-1].VERSION
+
+# Arbitrary constant shared by every process that runs migrations.
+_ADVISORY_LOCK_ID = 7_201_018
+
+metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than this code expects."""
+
+
+def current_version(connection: Connection) -> int:
+    return connection.scalar(select(func.coalesce(func.max(schema_version.c.version), 0)))
+
+
+def _record(connection: Connection, migration: ModuleType) -> None:
+    connection.execute(insert(schema_version).values(
+        version=migration.VERSION,
+        name=migration.__name__.rsplit(".", 1)[-1],
+        applied_at=datetime.utcnow(),
+    ))
+
+
+def _apply_in_transaction(lock: Connection, migration: ModuleType) -> None:
+    # A second connection would share the DBAPI connection under StaticPool
+    # and reset its autocommit mode when closed, so stay on ``lock``.
+    lock.commit()   # end the autobegun no-op transaction before switching
+    lock.execution_options(isolation_level=lock.default_isolation_level)
+    try:
+        with lock.begin():
+            migration.upgrade(lock)
+            _record(lock, migration)
+    finally:
+        lock.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def migrate(engine: Engine) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied."""
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        postgres = engine.dialect.name == "postgresql"
+        if postgres:
+            lock.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+        try:
+            metadata.create_all(lock, checkfirst=True)
+            done = current_version(lock)
+            for migration in MIGRATIONS:
+                if migration.VERSION <= done:
+                    continue
+                logger.info("Applying migration %s", migration.__name__)
+                if migration.TRANSACTIONAL:
+                    _apply_in_transaction(lock, migration)
+                else:
+                    migration.upgrade(lock)
+                    _record(lock, migration)
+                applied.append(migration.VERSION)
+        finally:
+            if postgres:
+                lock.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+    return applied
+
+
+def check_schema_version(engine: Engine) -> int:
+    """
+    Raises SchemaVersionError if ``migrate`` has not been run. Connection
+    errors propagate unchanged; only a missing schema_version table counts as
+    version 0.
+    """
+    with engine.connect() as connection:
+        try:
+            version = current_version(connection)
+        except DBAPIError:
+            connection.rollback()
+            if inspect(connection).has_table(schema_version.name):
+                raise
+            version = 0
+    if version < SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, this code needs {SCHEMA_VERSION}. "
+            "Run `python -m app.database_init migrate` first."
+        )
+    return version
@@ -1,23 +1,102 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index, bindparam, delete, insert, select, tuple_, update
 from sqlalchemy.orm import relationship
 import uuid
 
+from app.models.types import GUID
 from app.database import Base  # 🔥 use shared Base
 
 class Calculation(Base):
     __tablename__ = "calculations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
 
     operation = Column(String(50), nullable=False)
     a = Column(Float, nullable=False)
     b = Column(Float, nullable=False)
     result = Column(Float, nullable=False)
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=True)
     user = relationship("User", back_populates="calculations")
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Keyset pagination order (migration 0002).
+        Index("ix_calculations_created_at_id", "created_at", "id"),
+        # Browse/export filters (migration 0003).
+        Index("ix_calculations_operation_created_at_id", "operation", "created_at", "id"),
+        Index("ix_calculations_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_calculations_a", "a"),
+        Index("ix_calculations_b", "b"),
+        Index("ix_calculations_result", "result"),
+    )
+
+
+# ---------------------------------------------------------------
+# Prebuilt statements for the hot lookups. Built once at import, so each
+# request only binds parameters; construction and the compiled-cache key
+# are not redone per call.
+# ---------------------------------------------------------------
+CALCULATION_BY_ID = select(Calculation).where(Calculation.id == bindparam("calc_id"))
+
+CALCULATION_RESULTS_BY_IDS = select(Calculation.id, Calculation.result).where(
+    Calculation.id.in_(bindparam("calc_ids", expanding=True))
+)
+
+# Newest first. The row-value comparison walks ix_calculations_created_at_id
+# from the cursor, so every page costs the same however deep it is.
+CALCULATIONS_PAGE = (
+    select(Calculation)
+    .order_by(Calculation.created_at.desc(), Calculation.id.desc())
+    .limit(bindparam("limit"))
+)
+
+CALCULATIONS_PAGE_AFTER = CALCULATIONS_PAGE.where(
+    tuple_(Calculation.created_at, Calculation.id)
+    < tuple_(bindparam("after_created_at", type_=DateTime()), bindparam("after_id", type_=GUID()))
+)
+
+# Plain row tuples for the bulk export (no ORM identity map), oldest first.
+EXPORT_COLUMNS = (
+    Calculation.id,
+    Calculation.operation,
+    Calculation.a,
+    Calculation.b,
+    Calculation.result,
+    Calculation.user_id,
+    Calculation.created_at,
+    Calculation.updated_at,
+)
+CALCULATIONS_EXPORT = select(*EXPORT_COLUMNS).order_by(Calculation.created_at, Calculation.id)
+
+CALCULATION_OPERANDS_FOR_UPDATE = (
+    select(Calculation.operation, Calculation.a, Calculation.b)
+    .where(Calculation.id == bindparam("calc_id"))
+    .with_for_update()
+)
+
+# Single-statement writes: the row comes back through RETURNING, so there is
+# no follow-up SELECT/refresh. Python-side defaults (id, timestamps) are
+# still applied by the INSERT/UPDATE.
+INSERT_CALCULATION = insert(Calculation).returning(Calculation)
+
+UPDATE_CALCULATION = (
+    update(Calculation)
+    .where(Calculation.id == bindparam("calc_id"))
+    .values(
+        operation=bindparam("new_operation"),
+        a=bindparam("new_a"),
+        b=bindparam("new_b"),
+        result=bindparam("new_result"),
+    )
+    .returning(Calculation)
+    .execution_options(synchronize_session=False)
+)
+
+DELETE_CALCULATION = (
+    delete(Calculation)
+    .where(Calculation.id == bindparam("calc_id"))
+    .execution_options(synchronize_session=False)
+)
@@ -0,0 +1,21 @@
+import uuid
+
+from sqlalchemy import Uuid
+from sqlalchemy.types import TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """
+    Dialect-portable UUID column: native UUID on Postgres, CHAR(32) on SQLite.
+
+    Like Postgres, bind values may also be UUID strings, so lookups such as
+    ``Calculation.id == calc_id`` behave the same on every backend.
+    """
+
+    impl = Uuid(as_uuid=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
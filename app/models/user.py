@@ -2,15 +2,17 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import uuid
 
-from sqlalchemy import Column, String, DateTime, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Boolean, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, relationship
+from starlette.concurrency import run_in_threadpool
 
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from pydantic import ValidationError
 
 from app.schemas.user import UserCreate, UserResponse, Token
+from app.models.types import GUID
 from app.database import Base  # 🔥 IMPORTANT: use shared Base
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -26,7 +28,7 @@ class User(Base):
     # ---------------------------------------------------------------
     # Columns
     # ---------------------------------------------------------------
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
 
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
@@ -124,10 +126,10 @@ class User(Base):
         if not raw_pw or len(raw_pw) < 6:
             raise ValueError("Password must be at least 6 characters long")
 
-        existing = db.query(cls).filter(
-            (cls.email == user_data.get("email")) |
-            (cls.username == user_data.get("username"))
-        ).first()
+        existing = db.scalar(USER_ID_BY_EMAIL_OR_USERNAME, {
+            "email": user_data.get("email"),
+            "username": user_data.get("username"),
+        })
 
         if existing:
             raise ValueError("Username or email already exists")
@@ -159,14 +161,7 @@ class User(Base):
    
 
         # Lookup user
-        user = (
-            db.query(User)
-            .filter(
-                (User.username == username_or_email) |
-                (User.email == username_or_email)
-            )
-            .first()
-    )
+        user = db.scalar(USER_BY_LOGIN, {"login": username_or_email})
 
         if not user:
             return None
@@ -181,6 +176,13 @@ class User(Base):
         db.refresh(user)
 
     # Generate JWT
+        return User.token_response(user)
+
+    # ---------------------------------------------------------------
+    # Token response shared by the sync and async login paths
+    # ---------------------------------------------------------------
+    @staticmethod
+    def token_response(user: "User") -> Dict[str, Any]:
         token = User.create_access_token({"sub": str(user.id)})
 
         return {
@@ -194,7 +196,75 @@ class User(Base):
                 "username": user.username,
                 "is_active": user.is_active,
                 "is_verified": user.is_verified,
+                "created_at": user.created_at,
+                "updated_at": user.updated_at,
+            }
         }
-    }
 
+    # ---------------------------------------------------------------
+    # Async registration / authentication (AsyncSession)
+    #
+    # bcrypt is CPU-bound for ~100ms+, so hashing and verification run in
+    # the threadpool instead of blocking the event loop.
+    # ---------------------------------------------------------------
+    @classmethod
+    async def register_async(cls, db: AsyncSession, user_data: Dict[str, Any]) -> "User":
+        raw_pw = user_data.get("password")
+        if not raw_pw or len(raw_pw) < 6:
+            raise ValueError("Password must be at least 6 characters long")
+
+        existing = await db.scalar(USER_ID_BY_EMAIL_OR_USERNAME, {
+            "email": user_data.get("email"),
+            "username": user_data.get("username"),
+        })
+
+        if existing:
+            raise ValueError("Username or email already exists")
+
+        try:
+            validated = UserCreate.model_validate(user_data)
+        except ValidationError as e:
+            raise ValueError(str(e))
+
+        new_user = cls(
+            first_name=validated.first_name,
+            last_name=validated.last_name,
+            email=validated.email,
+            username=validated.username,
+            password_hash=await run_in_threadpool(cls.hash_password, validated.password),
+        )
+
+        db.add(new_user)
+        await db.flush()
+
+        return new_user
+
+    @staticmethod
+    async def authenticate_async(db: AsyncSession, username_or_email: str, password: str):
+        user = await db.scalar(USER_BY_LOGIN, {"login": username_or_email})
+
+        if not user:
+            return None
+
+        if not await run_in_threadpool(user.verify_password, password):
+            return None
+
+        user.last_login = datetime.utcnow()
+        await db.commit()
+
+        return User.token_response(user)
+
+
+# ---------------------------------------------------------------
+# Prebuilt statements for the hot lookups (bound per call; see
+# app/models/calculation.py)
+# ---------------------------------------------------------------
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+USER_BY_LOGIN = select(User).where(
+    (User.username == bindparam("login")) | (User.email == bindparam("login"))
+).limit(1)
 
+USER_ID_BY_EMAIL_OR_USERNAME = select(User.id).where(
+    (User.email == bindparam("email")) | (User.username == bindparam("username"))
+).limit(1)
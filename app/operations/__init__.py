@@ -19,6 +19,9 @@ from typing import Union
 
 Number = Union[int, float]
 
+DIVIDE_BY_ZERO_MESSAGE = "Cannot divide by zero!"
+NOT_FINITE_MESSAGE = "Result is not a finite real number"
+
 
 def add(a: Number, b: Number) -> Number:
     """Add two numbers and return the result."""
@@ -38,7 +41,7 @@ def multiply(a: Number, b: Number) -> Number:
 def divide(a: Number, b: Number) -> float:
     """Divide the first number by the second. Raises ValueError if b is zero."""
     if b == 0:
-        raise ValueError("Cannot divide by zero!")
+        raise ValueError(DIVIDE_BY_ZERO_MESSAGE)
     return a / b
 
 
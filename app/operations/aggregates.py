@@ -0,0 +1,208 @@
+# app/operations/aggregates.py
+
+"""
+Module: aggregates.py
+
+One-pass, constant-memory reductions over arbitrarily long numeric streams.
+Values arrive in chunks (NumPy arrays); each chunk is reduced with vectorized
+code and merged into a fixed-size running state, so memory does not grow with
+the number of elements.
+
+- sum / mean: per-chunk pairwise sums combined with Neumaier compensated
+  summation, so millions of chunks do not accumulate rounding error
+- variance: Welford's running mean/M2, merged per chunk with Chan et al.'s
+  parallel update (population variance)
+- min / max
+- product: tracked as mantissa and integer exponent (frexp), so intermediate
+  products never overflow or underflow
+- geometric_mean: compensated sum of logs; requires strictly positive values
+
+A final result that does not fit a float64 (e.g. the product of 1e200 and
+1e200) is rejected with a ValueError rather than returned as inf.
+
+Classes:
+- StreamingAggregate.update(chunk) / .result(name) / .results(names)
+
+Functions:
+- decode_float64_chunks(chunks) / decode_text_chunks(chunks) -> async
+  iterators turning request body bytes into float64 arrays
+"""
+
+import math
+import re
+from typing import AsyncIterable, AsyncIterator, Dict, Tuple
+
+import numpy as np
+
+from app.operations import NOT_FINITE_MESSAGE
+
+AGGREGATES: Tuple[str, ...] = (
+    "sum",
+    "mean",
+    "variance",
+    "min",
+    "max",
+    "product",
+    "geometric_mean",
+)
+
+# Mantissas are in [0.5, 1); a product of this many cannot underflow a float64.
+_PRODUCT_BLOCK = 1000
+
+
+class _CompensatedSum:
+    """Neumaier's variant of Kahan summation."""
+
+    __slots__ = ("total", "compensation")
+
+    def __init__(self):
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value: float) -> None:
+        t = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - t) + value
+        else:
+            self.compensation += (value - t) + self.total
+        self.total = t
+
+    @property
+    def value(self) -> float:
+        return self.total + self.compensation
+
+
+class StreamingAggregate:
+    def __init__(self):
+        self.count = 0
+        self._sum = _CompensatedSum()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._mantissa = 1.0
+        self._exponent = 0
+        self._log_sum = _CompensatedSum()
+        self._non_positive = False
+
+    def update(self, chunk: np.ndarray) -> None:
+        n = chunk.shape[0]
+        if n == 0:
+            return
+        if not np.isfinite(chunk).all():
+            raise ValueError("Values must be finite numbers")
+
+        chunk_sum = float(np.sum(chunk))
+        chunk_mean = chunk_sum / n
+        chunk_m2 = float(np.sum(np.square(chunk - chunk_mean)))
+
+        # Chan et al.: merge (count, mean, M2) of the chunk into the running state.
+        total = self.count + n
+        delta = chunk_mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        self._sum.add(chunk_sum)
+        self._min = min(self._min, float(np.min(chunk)))
+        self._max = max(self._max, float(np.max(chunk)))
+
+        mantissas, exponents = np.frexp(chunk)
+        self._exponent += int(np.sum(exponents, dtype=np.int64))
+        for start in range(0, n, _PRODUCT_BLOCK):
+            block = float(np.prod(mantissas[start:start + _PRODUCT_BLOCK]))
+            self._mantissa, exponent = math.frexp(self._mantissa * block)
+            self._exponent += exponent
+
+        if self._non_positive or (chunk <= 0).any():
+            self._non_positive = True
+        else:
+            self._log_sum.add(float(np.sum(np.log(chunk))))
+
+    def result(self, name: str) -> float:
+        """Raises ValueError for unknown names, undefined and non-finite results."""
+        if name not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {name}")
+        if self.count == 0:
+            if name == "sum":
+                return 0.0
+            if name == "product":
+                return 1.0
+            raise ValueError(f"{name} of an empty array is undefined")
+
+        value = self._value(name)
+        if not math.isfinite(value):
+            raise ValueError(f"{name}: {NOT_FINITE_MESSAGE}")
+        return value
+
+    def _value(self, name: str) -> float:
+        if name == "sum":
+            return self._sum.value
+        if name == "mean":
+            return self._sum.value / self.count
+        if name == "variance":
+            return self._m2 / self.count
+        if name == "min":
+            return self._min
+        if name == "max":
+            return self._max
+        if name == "product":
+            try:
+                return math.ldexp(self._mantissa, self._exponent)
+            except OverflowError:
+                return math.copysign(math.inf, self._mantissa)
+        # geometric_mean
+        if self._non_positive:
+            raise ValueError("geometric_mean requires strictly positive values")
+        return math.exp(self._log_sum.value / self.count)
+
+    def results(self, names) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """``(results, errors)``: an undefined aggregate does not fail the others."""
+        results, errors = {}, {}
+        for name in names:
+            try:
+                results[name] = self.result(name)
+            except ValueError as e:
+                errors[name] = str(e)
+        return results, errors
+
+
+async def decode_float64_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[np.ndarray]:
+    """Raw little-endian float64 values; carries partial values across chunks."""
+    remainder = b""
+    async for chunk in chunks:
+        data = remainder + chunk if remainder else chunk
+        usable = len(data) - len(data) % 8
+        remainder = data[usable:]
+        if usable:
+            yield np.frombuffer(data, dtype="<f8", count=usable // 8)
+    if remainder:
+        raise ValueError("Body length is not a multiple of 8 bytes")
+
+
+_SEPARATOR = re.compile(rb"[\s,]")
+_MAX_TOKEN_BYTES = 64
+
+
+async def decode_text_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[np.ndarray]:
+    """Numbers separated by whitespace, commas or newlines."""
+    remainder = b""
+    async for chunk in chunks:
+        data = remainder + chunk
+        # The last token may continue in the next chunk.
+        cut = max(data.rfind(b" "), data.rfind(b"\n"), data.rfind(b","), data.rfind(b"\t"))
+        remainder, data = data[cut + 1:], data[:cut + 1]
+        if len(remainder) > _MAX_TOKEN_BYTES:
+            raise ValueError("Invalid number in body: token too long")
+        if data:
+            yield _parse_numbers(data)
+    if remainder:
+        yield _parse_numbers(remainder)
+
+
+def _parse_numbers(data: bytes) -> np.ndarray:
+    tokens = [token for token in _SEPARATOR.split(data) if token]
+    try:
+        return np.array(tokens, dtype=np.float64)
+    except ValueError as e:
+        raise ValueError(f"Invalid number in body: {e}")
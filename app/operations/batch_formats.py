@@ -0,0 +1,152 @@
+# app/operations/batch_formats.py
+
+"""
+Module: batch_formats.py
+
+Binary wire formats for batch evaluation, next to the default JSON body.
+Operand arrays are wrapped with ``np.frombuffer`` over the request bytes, so
+they are never materialized as Python floats.
+
+Raw float64 (``application/octet-stream``), all little-endian:
+
+    request   header  "CALC" | version u8 | op u8 | reserved u16 | count u32
+              body    a: float64[count] | b: float64[count]
+                      | codes: uint8[count]       (only when op == 255)
+
+    response  header  "CALR" | version u8 | reserved u8[3] | count u32
+              body    results: float64[count] | status: uint8[count]
+
+``op`` indexes OPERATION_NAMES (0 add, 1 subtract, 2 multiply, 3 divide,
+4 power); 255 means one code per element follows the operands. ``status`` is
+0 for success, otherwise an index into STATUS_MESSAGES; failed results are NaN.
+
+MessagePack (``application/msgpack``): the same map as the JSON body. ``a``
+and ``b`` may be arrays of numbers or ``bin`` values holding raw little-endian
+float64 data (the zero-copy path). Responses mirror the JSON response.
+
+Functions:
+- decode_raw_batch(body) / encode_raw_result(batch)
+- decode_msgpack_batch(body) / encode_msgpack_result(batch)
+"""
+
+import struct
+from typing import Tuple
+
+import msgpack
+import numpy as np
+
+from app.operations import DIVIDE_BY_ZERO_MESSAGE
+from app.operations.vectorized import (
+    INVALID_OPERATION_MESSAGE,
+    NOT_FINITE_MESSAGE,
+    OPERATION_NAMES,
+    BatchResult,
+)
+
+RAW_MEDIA_TYPE = "application/octet-stream"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+RAW_VERSION = 1
+PER_ELEMENT_OP = 255
+_REQUEST_HEADER = struct.Struct("<4sBBHI")
+_RESPONSE_HEADER = struct.Struct("<4sB3xI")
+
+STATUS_MESSAGES: Tuple[str, ...] = (
+    "",
+    DIVIDE_BY_ZERO_MESSAGE,
+    NOT_FINITE_MESSAGE,
+    INVALID_OPERATION_MESSAGE,
+)
+_STATUS_CODES = {message: code for code, message in enumerate(STATUS_MESSAGES) if code}
+
+Operations = str | np.ndarray | list
+
+
+class BatchFormatError(ValueError):
+    """The request body does not match the declared binary format."""
+
+
+def _float64_view(buffer, count: int, offset: int = 0) -> np.ndarray:
+    return np.frombuffer(buffer, dtype="<f8", count=count, offset=offset)
+
+
+def decode_raw_batch(body: bytes) -> Tuple[Operations, np.ndarray, np.ndarray]:
+    if len(body) < _REQUEST_HEADER.size:
+        raise BatchFormatError("Body is shorter than the batch header")
+    magic, version, op, _, count = _REQUEST_HEADER.unpack_from(body)
+    if magic != b"CALC" or version != RAW_VERSION:
+        raise BatchFormatError("Unknown batch format or version")
+
+    per_element = op == PER_ELEMENT_OP
+    expected = _REQUEST_HEADER.size + 16 * count + (count if per_element else 0)
+    if len(body) != expected:
+        raise BatchFormatError(f"Expected {expected} bytes for {count} items, got {len(body)}")
+    if not per_element and op >= len(OPERATION_NAMES):
+        raise BatchFormatError(f"Unknown operation code {op}")
+
+    offset = _REQUEST_HEADER.size
+    a = _float64_view(body, count, offset)
+    b = _float64_view(body, count, offset + 8 * count)
+    if per_element:
+        operations = np.frombuffer(body, dtype=np.uint8, count=count, offset=offset + 16 * count)
+    else:
+        operations = OPERATION_NAMES[op]
+    return operations, a, b
+
+
+def encode_raw_result(batch: BatchResult) -> bytes:
+    count = batch.results.shape[0]
+    status = np.zeros(count, dtype=np.uint8)
+    for index, message in batch.errors.items():
+        status[index] = _STATUS_CODES.get(message, _STATUS_CODES[NOT_FINITE_MESSAGE])
+    results = batch.results.astype("<f8", copy=True)
+    results[status != 0] = np.nan
+    return b"".join((
+        _RESPONSE_HEADER.pack(b"CALR", RAW_VERSION, count),
+        results.tobytes(),
+        status.tobytes(),
+    ))
+
+
+def _msgpack_operand(value, name: str) -> np.ndarray:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if len(value) % 8:
+            raise BatchFormatError(f"{name}: binary operands must be float64 (8-byte) values")
+        return np.frombuffer(value, dtype="<f8")
+    if isinstance(value, list):
+        try:
+            array = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise BatchFormatError(f"{name}: must contain only numbers")
+        if array.ndim != 1:
+            raise BatchFormatError(f"{name}: must be a flat array of numbers")
+        return array
+    raise BatchFormatError(f"{name}: must be an array or float64 bin")
+
+
+def decode_msgpack_batch(body: bytes) -> Tuple[Operations, np.ndarray, np.ndarray]:
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise BatchFormatError(f"Invalid MessagePack body: {e}")
+    if not isinstance(payload, dict) or not {"operations", "a", "b"} <= payload.keys():
+        raise BatchFormatError("Body must be a map with operations, a and b")
+
+    operations = payload["operations"]
+    if not isinstance(operations, (str, list)) or (
+        isinstance(operations, list) and not all(isinstance(op, str) for op in operations)
+    ):
+        raise BatchFormatError("operations: must be a string or an array of strings")
+
+    a = _msgpack_operand(payload["a"], "a")
+    b = _msgpack_operand(payload["b"], "b")
+    if a.shape != b.shape:
+        raise BatchFormatError("a and b must have the same length")
+    if isinstance(operations, list) and len(operations) != a.shape[0]:
+        raise BatchFormatError("operations, a and b must have the same length")
+    return operations, a, b
+
+
+def encode_msgpack_result(batch: BatchResult) -> bytes:
+    results, errors = batch.to_lists()
+    return msgpack.packb({"results": results, "errors": errors}, use_bin_type=True)
@@ -0,0 +1,28 @@
+# app/operations/bounded.py
+
+"""
+Module: bounded.py
+
+Exponentiation with its failure modes mapped to calculator errors. Every
+route parses operands as floats, and float ``a ** b`` is O(1) however large
+the operands are, so the only thing to bound is the result: overflow, zero
+raised to a negative power and complex results become ValueErrors (400s)
+instead of escaping as 500s.
+
+Functions:
+- bounded_power(a, b) -> ``power`` with overflow and domain errors as ValueError
+"""
+
+from app.operations import Number, power
+
+
+def bounded_power(a: Number, b: Number) -> Number:
+    try:
+        result = power(a, b)
+    except OverflowError:
+        raise ValueError("Result too large")
+    except ZeroDivisionError:
+        raise ValueError("Cannot raise zero to a negative power")
+    if isinstance(result, complex):
+        raise ValueError("Result is not a real number")
+    return result
@@ -0,0 +1,145 @@
+# app/operations/dag.py
+
+"""
+Module: dag.py
+
+Planning and evaluation of calculation DAGs. Each node is
+``(operation, a, b)`` where an operand is either a number, ``("node", id)``
+referring to another node of the same DAG, or ``("calculation", uuid)``
+referring to the result of an already stored calculation.
+
+Planning topologically sorts the nodes (rejecting cycles and dangling
+references) and eliminates common subexpressions: nodes that compute the same
+operation over the same operands (up to operand order for ``add`` and
+``multiply``) share a single canonical node, which is evaluated once.
+
+Functions:
+- topological_order(nodes) -> node ids, dependencies first
+- plan_dag(nodes) -> DagPlan(order, canonical)
+- referenced_calculations(nodes) -> stored calculation ids used as operands
+- evaluate_dag(nodes, plan, calculation_results, evaluate) -> per-node values
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+from uuid import UUID
+
+Operand = float | Tuple[str, Any]
+DagNode = Tuple[str, Operand, Operand]
+
+COMMUTATIVE = frozenset({"add", "multiply"})
+
+
+class DagError(ValueError):
+    """The DAG is malformed (cycle, unknown node) or a node failed to evaluate."""
+
+
+@dataclass
+class DagPlan:
+    order: List[str]            # canonical node ids, dependencies first
+    canonical: Dict[str, str]   # every node id -> the node that computes it
+
+
+def _node_refs(node: DagNode) -> List[str]:
+    return [operand[1] for operand in node[1:] if isinstance(operand, tuple) and operand[0] == "node"]
+
+
+def topological_order(nodes: Mapping[str, DagNode]) -> List[str]:
+    """Kahn's algorithm; ties keep submission order so results are deterministic."""
+    dependents: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+    pending: Dict[str, int] = {}
+    for node_id, node in nodes.items():
+        refs = set(_node_refs(node))
+        for ref in refs:
+            if ref not in nodes:
+                raise DagError(f"Node {node_id} references unknown node {ref}")
+            dependents[ref].append(node_id)
+        pending[node_id] = len(refs)
+
+    ready = [node_id for node_id, count in pending.items() if count == 0]
+    order = []
+    while ready:
+        node_id = ready.pop(0)
+        order.append(node_id)
+        for dependent in dependents[node_id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    if len(order) != len(nodes):
+        stuck = sorted(node_id for node_id, count in pending.items() if count)
+        raise DagError(f"Cycle detected between nodes: {', '.join(stuck)}")
+    return order
+
+
+def plan_dag(nodes: Mapping[str, DagNode]) -> DagPlan:
+    first_with_key: Dict[tuple, str] = {}
+    canonical: Dict[str, str] = {}
+    order: List[str] = []
+
+    def operand_key(operand: Operand) -> tuple:
+        if isinstance(operand, tuple):
+            kind, ref = operand
+            if kind == "node":
+                # The canonical node stands for its whole subexpression, so
+                # keys stay fixed-size however deep the DAG is.
+                return ("node", canonical[ref])
+            return ("calculation", str(ref))
+        # Exact float bits, so 0.1 + 0.2 and 0.3 are not merged.
+        return ("value", struct.pack("<d", operand))
+
+    for node_id in topological_order(nodes):
+        operation, a, b = nodes[node_id]
+        operands = [operand_key(a), operand_key(b)]
+        if operation in COMMUTATIVE:
+            operands.sort(key=repr)
+        key = (operation, *operands)
+        if key in first_with_key:
+            canonical[node_id] = first_with_key[key]
+        else:
+            first_with_key[key] = canonical[node_id] = node_id
+            order.append(node_id)
+
+    return DagPlan(order=order, canonical=canonical)
+
+
+def evaluate_dag(
+    nodes: Mapping[str, DagNode],
+    plan: DagPlan,
+    calculation_results: Mapping[UUID, float],
+    evaluate: Callable[[str, float, float], float],
+) -> Dict[str, Tuple[str, float, float, float]]:
+    """
+    Evaluate canonical nodes in dependency order. Returns
+    ``{canonical_id: (operation, a, b, result)}`` with operands resolved.
+    A ValueError from ``evaluate`` is re-raised as DagError naming the node.
+    """
+    values: Dict[str, Tuple[str, float, float, float]] = {}
+
+    def resolve(operand: Operand) -> float:
+        if isinstance(operand, tuple):
+            kind, ref = operand
+            if kind == "node":
+                return values[plan.canonical[ref]][3]
+            return calculation_results[ref]
+        return operand
+
+    for node_id in plan.order:
+        operation, a, b = nodes[node_id]
+        a_value, b_value = resolve(a), resolve(b)
+        try:
+            result = evaluate(operation, a_value, b_value)
+        except ValueError as e:
+            raise DagError(f"Node {node_id}: {e}") from e
+        values[node_id] = (operation, a_value, b_value, result)
+    return values
+
+
+def referenced_calculations(nodes: Mapping[str, DagNode]) -> set:
+    return {
+        operand[1]
+        for node in nodes.values()
+        for operand in node[1:]
+        if isinstance(operand, tuple) and operand[0] == "calculation"
+    }
@@ -0,0 +1,253 @@
+# app/operations/expression.py
+
+"""
+Module: expression.py
+
+A small, safe expression engine built on the calculator operations. Formulas
+such as ``(a + b) ^ c / d`` are tokenized and parsed once (no ``eval``) into a
+tree of closures that call ``add``, ``subtract``, ``multiply``, ``divide`` and
+``power``. Compiled expressions are kept in a bounded LRU cache keyed by the
+whitespace-normalized expression text, so evaluating the same formula with new
+variable bindings skips parsing entirely.
+
+Grammar (lowest to highest precedence):
+    expr  := term (("+" | "-") term)*
+    term  := unary (("*" | "/") unary)*
+    unary := ("-" | "+") unary | pow
+    pow   := atom (("^" | "**") unary)?        right-associative
+    atom  := NUMBER | NAME | "(" expr ")"
+
+Functions:
+- compile_expression(text) -> CompiledExpression (cached)
+- evaluate_expression(text, variables) -> float
+- expression_cache_info() -> hit/miss counters of the compiled-expression cache
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Mapping, Tuple
+
+from app.config import settings
+from app.operations import NOT_FINITE_MESSAGE, add, subtract, multiply, divide, power
+
+Evaluator = Callable[[Mapping[str, float]], float]
+
+MAX_NESTING_DEPTH = 100
+
+BINARY_OPERATORS = {
+    "+": add,
+    "-": subtract,
+    "*": multiply,
+    "/": divide,
+    "^": power,
+}
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<op>\*\*|[-+*/^()])"
+    r")"
+)
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be parsed or evaluated."""
+
+
+def normalize_expression(text: str) -> str:
+    """Collapse runs of whitespace so equivalent spellings share a cache entry."""
+    return " ".join(text.split())
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ExpressionError(f"Unexpected character at position {pos}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if value == "**":
+            value = "^"
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class CompiledExpression:
+    """A parsed expression; call ``evaluate`` with a mapping of variable values."""
+
+    __slots__ = ("text", "variables", "_fn")
+
+    def __init__(self, text: str, variables: FrozenSet[str], fn: Evaluator):
+        self.text = text
+        self.variables = variables
+        self._fn = fn
+
+    def evaluate(self, variables: Mapping[str, float] | None = None) -> float:
+        env = variables or {}
+        missing = self.variables.difference(env)
+        if missing:
+            raise ExpressionError(f"Unbound variable(s): {', '.join(sorted(missing))}")
+        try:
+            result = self._fn(env)
+            if isinstance(result, complex):
+                raise ExpressionError("Result is not a real number")
+            result = float(result)
+        except OverflowError:
+            raise ExpressionError(NOT_FINITE_MESSAGE)
+        except ZeroDivisionError as e:
+            raise ExpressionError(str(e))
+        if not math.isfinite(result):
+            raise ExpressionError(NOT_FINITE_MESSAGE)
+        return result
+
+    def __repr__(self):
+        return f"<CompiledExpression({self.text!r})>"
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+        self.variables: set = set()
+
+    # -- token helpers -------------------------------------------------
+    def _peek(self) -> str | None:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][1]
+        return None
+
+    def _next(self) -> Tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise ExpressionError("Unexpected end of expression")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    # -- grammar -------------------------------------------------------
+    def parse(self) -> Tuple[Evaluator, bool]:
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"Unexpected token {self.tokens[self.pos][1]!r}")
+        return node
+
+    def _expr(self):
+        node = self._term()
+        while self._peek() in ("+", "-"):
+            op = self._next()[1]
+            node = _binary(op, node, self._term())
+        return node
+
+    def _term(self):
+        node = self._unary()
+        while self._peek() in ("*", "/"):
+            op = self._next()[1]
+            node = _binary(op, node, self._unary())
+        return node
+
+    def _unary(self):
+        if self._peek() in ("-", "+"):
+            op = self._next()[1]
+            self._enter()
+            operand = self._unary()
+            self.depth -= 1
+            if op == "+":
+                return operand
+            return _binary("-", _constant(0.0), operand)
+        return self._pow()
+
+    def _pow(self):
+        base = self._atom()
+        if self._peek() == "^":
+            self._next()
+            self._enter()
+            exponent = self._unary()
+            self.depth -= 1
+            return _binary("^", base, exponent)
+        return base
+
+    def _atom(self):
+        kind, value = self._next()
+        if kind == "number":
+            return _constant(float(value))
+        if kind == "name":
+            self.variables.add(value)
+            return (lambda env, name=value: env[name]), False
+        if value == "(":
+            self._enter()
+            node = self._expr()
+            self.depth -= 1
+            if self._peek() != ")":
+                raise ExpressionError("Missing closing parenthesis")
+            self._next()
+            return node
+        raise ExpressionError(f"Unexpected token {value!r}")
+
+    def _enter(self):
+        self.depth += 1
+        if self.depth > MAX_NESTING_DEPTH:
+            raise ExpressionError("Expression is nested too deeply")
+
+
+# Nodes are (evaluator, is_constant) pairs so constant sub-expressions can be
+# folded at compile time.
+def _constant(value: float) -> Tuple[Evaluator, bool]:
+    return (lambda env: value), True
+
+
+def _binary(op: str, left, right) -> Tuple[Evaluator, bool]:
+    fn = BINARY_OPERATORS[op]
+    left_fn, left_const = left
+    right_fn, right_const = right
+
+    if left_const and right_const:
+        try:
+            value = fn(left_fn({}), right_fn({}))
+        except (ValueError, OverflowError, ZeroDivisionError):
+            # Leave it for evaluation time so the error surfaces per call.
+            pass
+        else:
+            if not isinstance(value, complex):
+                return _constant(value)
+
+    return (lambda env: fn(left_fn(env), right_fn(env))), False
+
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def _compile_normalized(text: str) -> CompiledExpression:
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ExpressionError("Expression is empty")
+    parser = _Parser(tokens)
+    fn, _ = parser.parse()
+    return CompiledExpression(text, frozenset(parser.variables), fn)
+
+
+def compile_expression(text: str) -> CompiledExpression:
+    """Parse ``text`` once; later calls with the same formula hit the cache."""
+    return _compile_normalized(normalize_expression(text))
+
+
+def evaluate_expression(text: str, variables: Mapping[str, float] | None = None) -> float:
+    """Compile (or fetch from cache) and evaluate ``text`` with ``variables``."""
+    return compile_expression(text).evaluate(variables)
+
+
+def expression_cache_info() -> Dict[str, int]:
+    info = _compile_normalized.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def clear_expression_cache() -> None:
+    _compile_normalized.cache_clear()
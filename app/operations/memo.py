@@ -0,0 +1,106 @@
+# app/operations/memo.py
+
+"""
+Module: memo.py
+
+Opt-in memoization for the calculator operations. Results are cached in a
+bounded LRU with an optional TTL, keyed on the operation name and the exact
+IEEE-754 bits of both operands (so 0.0 and -0.0 are distinct entries and no
+float formatting is involved). Failed evaluations are never cached.
+
+Classes:
+- ResultCache(max_size, ttl_seconds) -> thread-safe LRU/TTL cache with
+  hit/miss/eviction/expiration counters
+"""
+
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from app.config import settings
+from app.operations import Number
+
+_OPERANDS = struct.Struct("<dd")
+
+
+def result_key(operation: str, a: float, b: float) -> Tuple[str, bytes]:
+    """Cache key built from the exact float bits of the operands."""
+    return operation, _OPERANDS.pack(a, b)
+
+
+class ResultCache:
+    def __init__(self, max_size: int, ttl_seconds: float = 0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple[Number, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_compute(
+        self,
+        operation: str,
+        fn: Callable[[Number, Number], Number],
+        a: float,
+        b: float,
+    ) -> Tuple[Number, bool]:
+        """Return ``(result, hit)``; ``fn`` only runs on a miss, outside the lock."""
+        key = result_key(operation, a, b)
+        now = time.monotonic()
+        found, value = self._lookup(key, now)
+        if found:
+            return value, True
+        value = fn(a, b)
+        self._store(key, value, now)
+        return value, False
+
+    def _lookup(self, key: Tuple[str, bytes], now: float) -> Tuple[bool, Number | None]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if not expires_at or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def _store(self, key: Tuple[str, bytes], value: Number, now: float) -> None:
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, int | float | bool]:
+        with self._lock:
+            return {
+                "enabled": settings.RESULT_CACHE_ENABLED,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+result_cache = ResultCache(
+    max_size=settings.RESULT_CACHE_SIZE,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+)
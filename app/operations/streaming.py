@@ -0,0 +1,121 @@
+# app/operations/streaming.py
+
+"""
+Module: streaming.py
+
+Incremental NDJSON evaluation. Records of the form ``{"op": .., "a": .., "b": ..}``
+are read one line at a time from an async iterator of byte chunks, evaluated in
+micro-batches with the vectorized kernels, and yielded back as NDJSON lines as
+soon as each micro-batch is done. At most one chunk, one partial line and one
+micro-batch are held in memory, whatever the size of the stream.
+
+Output lines are ``{"index": i, "result": x}`` or ``{"index": i, "error": msg}``,
+where ``i`` counts non-blank input lines from 0.
+
+Functions:
+- evaluate_ndjson(chunks, batch_size) -> async iterator of NDJSON byte strings
+"""
+
+from typing import AsyncIterable, AsyncIterator, List, Tuple
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from app.operations.vectorized import evaluate_batch
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+class OperationRecord(TypedDict):
+    op: str
+    a: float
+    b: float
+
+
+RECORD_ADAPTER = TypeAdapter(OperationRecord)
+
+
+def _record_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{err['loc'][-1] if err['loc'] else 'record'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+class _MicroBatch:
+    def __init__(self):
+        self.indices: List[int] = []
+        self.ops: List[str] = []
+        self.a: List[float] = []
+        self.b: List[float] = []
+        self.errors: List[Tuple[int, str]] = []
+
+    def __len__(self):
+        return len(self.indices) + len(self.errors)
+
+    def flush(self) -> bytes:
+        lines = []
+        if self.indices:
+            batch = evaluate_batch(self.ops, self.a, self.b)
+            results = batch.results.tolist()
+            for position, index in enumerate(self.indices):
+                message = batch.errors.get(position)
+                if message is None:
+                    lines.append({"index": index, "result": results[position]})
+                else:
+                    lines.append({"index": index, "error": message})
+        lines.extend({"index": index, "error": message} for index, message in self.errors)
+        lines.sort(key=lambda line: line["index"])
+        self.__init__()
+        return b"".join(orjson.dumps(line) + b"\n" for line in lines)
+
+
+async def evaluate_ndjson(
+    chunks: AsyncIterable[bytes],
+    batch_size: int = 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Evaluate an NDJSON stream of operations. A micro-batch is flushed when it
+    reaches ``batch_size`` and at the end of every input chunk, so a slow
+    producer still gets timely answers.
+    """
+    pending = _MicroBatch()
+    buffer = b""
+    index = 0
+
+    def lines_from(data: bytes):
+        nonlocal index
+        for line in data.split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                record = RECORD_ADAPTER.validate_json(line)
+            except ValidationError as e:
+                pending.errors.append((index, _record_error(e)))
+            else:
+                pending.indices.append(index)
+                pending.ops.append(record["op"])
+                pending.a.append(record["a"])
+                pending.b.append(record["b"])
+            index += 1
+            if len(pending) >= batch_size:
+                yield pending.flush()
+
+    async for chunk in chunks:
+        head, sep, buffer = (buffer + chunk).rpartition(b"\n")
+        if sep:
+            for out in lines_from(head):
+                yield out
+            if len(pending):
+                yield pending.flush()
+        if len(buffer) > MAX_LINE_BYTES:
+            yield orjson.dumps(
+                {"index": index, "error": f"Line exceeds {MAX_LINE_BYTES} bytes"}
+            ) + b"\n"
+            return
+
+    for out in lines_from(buffer):
+        yield out
+    if len(pending):
+        yield pending.flush()
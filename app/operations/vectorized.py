@@ -0,0 +1,211 @@
+# app/operations/vectorized.py
+
+"""
+Module: vectorized.py
+
+Array versions of the calculator operations. Each kernel takes two float64
+NumPy arrays and returns the element-wise result together with a boolean mask
+of the elements that failed, so a whole batch can be evaluated in a handful of
+array passes instead of one Python call (and one HTTP request) per item.
+
+Functions:
+- add_kernel(a, b), subtract_kernel(a, b), multiply_kernel(a, b),
+  power_kernel(a, b) -> flag results that are not finite real numbers
+- divide_kernel(a, b) -> also flags every element where b == 0
+- evaluate_batch(operations, a, b) -> BatchResult
+- range_values(start, stop, step) -> evenly spaced operand array
+- sweep_rows(operation, a, b, rows_per_chunk) -> row blocks of the a x b grid
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from app.operations import (
+    DIVIDE_BY_ZERO_MESSAGE,
+    NOT_FINITE_MESSAGE,
+    add,
+    subtract,
+    multiply,
+    power,
+)
+
+INVALID_OPERATION_MESSAGE = "Invalid operation"
+
+Kernel = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+def _not_finite(out: np.ndarray) -> np.ndarray:
+    return ~np.isfinite(out)
+
+
+def add_kernel(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Element-wise add; flags results that overflow to inf."""
+    with np.errstate(all="ignore"):
+        out = add(a, b)
+    return out, _not_finite(out)
+
+
+def subtract_kernel(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Element-wise subtract; flags results that overflow to inf."""
+    with np.errstate(all="ignore"):
+        out = subtract(a, b)
+    return out, _not_finite(out)
+
+
+def multiply_kernel(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Element-wise multiply; flags results that overflow to inf."""
+    with np.errstate(all="ignore"):
+        out = multiply(a, b)
+    return out, _not_finite(out)
+
+
+def divide_kernel(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Element-wise divide. The scalar ``divide`` guard cannot be applied to a whole
+    array, so elements with b == 0 are masked out and flagged instead of raising;
+    quotients that overflow to inf are flagged as well.
+    """
+    zero = b == 0
+    with np.errstate(all="ignore"):
+        if not zero.any():
+            out = np.divide(a, b)
+            return out, _not_finite(out)
+        out = np.full(a.shape, np.nan)
+        np.divide(a, b, out=out, where=~zero)
+    return out, zero | _not_finite(out)
+
+
+def power_kernel(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Element-wise power. The scalar version raises (or returns a complex number)
+    for 0 ** negative, negative ** fractional and overflow; here those elements
+    come back as inf/nan and are flagged.
+    """
+    with np.errstate(all="ignore"):
+        out = power(a, b)
+    return out, _not_finite(out)
+
+
+KERNELS: Dict[str, Kernel] = {
+    "add": add_kernel,
+    "subtract": subtract_kernel,
+    "multiply": multiply_kernel,
+    "divide": divide_kernel,
+    "power": power_kernel,
+}
+
+# Stable numbering for compact wire formats (uint8 per element).
+OPERATION_NAMES: Tuple[str, ...] = tuple(KERNELS)
+
+
+def failure_message(operation: str, b: float) -> str:
+    """Why a flagged element failed: division by zero, otherwise a non-finite result."""
+    if operation == "divide" and b == 0:
+        return DIVIDE_BY_ZERO_MESSAGE
+    return NOT_FINITE_MESSAGE
+
+
+@dataclass
+class BatchResult:
+    """Results of a batch; ``results[i]`` is meaningless where ``errors`` has ``i``."""
+    results: np.ndarray
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    def to_lists(self) -> Tuple[List[float | None], List[dict]]:
+        values = self.results.tolist()
+        for index in self.errors:
+            values[index] = None
+        errors = [
+            {"index": index, "error": message}
+            for index, message in sorted(self.errors.items())
+        ]
+        return values, errors
+
+
+def evaluate_batch(
+    operations: Sequence[str] | str | np.ndarray,
+    a: Sequence[float] | np.ndarray,
+    b: Sequence[float] | np.ndarray,
+) -> BatchResult:
+    """
+    Evaluate ``operations[i](a[i], b[i])`` for every i. ``operations`` may also be
+    a single name applied to every element, or an integer array of indexes into
+    OPERATION_NAMES. Elements are grouped by operation so each kernel runs once
+    over its whole slice of the batch.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if a.shape != b.shape:
+        raise ValueError("a and b must have the same length")
+
+    results = np.full(a.shape, np.nan)
+    errors: Dict[int, str] = {}
+
+    if isinstance(operations, str):
+        groups = [(operations, None)]
+    elif isinstance(operations, np.ndarray) and operations.dtype.kind in "iu":
+        if operations.shape != a.shape:
+            raise ValueError("operations, a and b must have the same length")
+        groups = [
+            (OPERATION_NAMES[code] if 0 <= code < len(OPERATION_NAMES) else None,
+             operations == code)
+            for code in np.unique(operations).tolist()
+        ]
+    else:
+        if len(operations) != a.shape[0]:
+            raise ValueError("operations, a and b must have the same length")
+        ops = np.asarray(operations)
+        groups = [(name, ops == name) for name in set(operations)]
+
+    for name, mask in groups:
+        kernel = KERNELS.get(name)
+        indices = np.arange(a.shape[0]) if mask is None else np.flatnonzero(mask)
+
+        if kernel is None:
+            for index in indices.tolist():
+                errors[index] = INVALID_OPERATION_MESSAGE
+            continue
+
+        if mask is None:
+            out, failed = kernel(a, b)
+            results = out
+        else:
+            out, failed = kernel(a[mask], b[mask])
+            results[mask] = out
+
+        if failed.any():
+            for index in indices[failed].tolist():
+                errors[index] = failure_message(name, b[index])
+
+    return BatchResult(results=results, errors=errors)
+
+
+def range_values(start: float, stop: float, step: float) -> np.ndarray:
+    """
+    ``start, start + step, ...`` up to but excluding ``stop``, like ``range``.
+    Computed as ``start + step * i`` so long ranges do not accumulate error.
+    """
+    count = max(0, math.ceil((stop - start) / step))
+    return start + step * np.arange(count, dtype=np.float64)
+
+
+def sweep_rows(
+    operation: str,
+    a: np.ndarray,
+    b: np.ndarray,
+    rows_per_chunk: int = 256,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Evaluate ``operation`` over the Cartesian grid ``a x b`` (row i is a[i]).
+    Yields ``(values, failed)`` blocks of shape ``(rows, len(b))`` so callers
+    can stream a large grid without materializing all of it.
+    """
+    kernel = KERNELS[operation]
+    cols = b.shape[0]
+    for start in range(0, a.shape[0], rows_per_chunk):
+        rows = a[start:start + rows_per_chunk]
+        values, failed = kernel(np.repeat(rows, cols), np.tile(b, rows.shape[0]))
+        yield values.reshape(rows.shape[0], cols), failed.reshape(rows.shape[0], cols)
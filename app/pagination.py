@@ -0,0 +1,33 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor is the sort key ``(created_at, id)`` of the last row on a page,
+base64url-encoded so clients treat it as a token rather than something to
+build or edit. The next page is ``WHERE (created_at, id) < cursor`` on a
+composite index, so fetching page 1000 costs the same as page 1 (OFFSET
+would scan and discard every row before it).
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by encode_cursor()."""
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
 
@@ -12,16 +12,15 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 # REGISTER
 # ---------------------------------------------------------
 @router.post("/register", response_model=Token)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
 
     # Check password confirmation
-    if user_data.password != user_data.confirm_password:
+    if user_data.confirm_password is not None and user_data.password != user_data.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
 
     try:
-        new_user = User.register(db, user_data.model_dump())
-        db.commit()
-        db.refresh(new_user)
+        new_user = await User.register_async(db, user_data.model_dump())
+        await db.commit()
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -39,28 +38,20 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 # LOGIN
 # ---------------------------------------------------------
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
 
-    # Authenticate user by username or email
-    user = User.authenticate(
-        db=db,
-        username=credentials.username,
-        password=credentials.password
+    # Authenticate user by username or email; returns the Token payload
+    auth_result = await User.authenticate_async(
+        db,
+        credentials.username,
+        credentials.password
     )
 
     # Failed authentication → 401
-    if user is None:
+    if auth_result is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
 
-    # Create JWT
-    token = User.create_access_token({"sub": str(user.id)})
-
-    # Return full Token schema (required)
-    return {
-        "access_token": token,
-        "token_type": "bearer",
-        "user": UserResponse.model_validate(user)
-    }
+    return auth_result
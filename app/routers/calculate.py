@@ -0,0 +1,457 @@
+# app/routers/calculate.py
+
+import hashlib
+import math
+from urllib.parse import urlencode
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, RedirectResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db, pin_to_primary
+from app.models.calculation import Calculation
+from app.operations import add, subtract, multiply, divide
+from app.operations.aggregates import (
+    AGGREGATES,
+    StreamingAggregate,
+    decode_float64_chunks,
+    decode_text_chunks,
+)
+from app.operations.batch_formats import (
+    MSGPACK_MEDIA_TYPES,
+    RAW_MEDIA_TYPE,
+    BatchFormatError,
+    decode_msgpack_batch,
+    decode_raw_batch,
+    encode_msgpack_result,
+    encode_raw_result,
+)
+from app.operations.bounded import bounded_power
+from app.operations.expression import evaluate_expression
+from app.operations.streaming import evaluate_ndjson
+from app.operations.vectorized import (
+    NOT_FINITE_MESSAGE,
+    evaluate_batch,
+    range_values,
+    sweep_rows,
+)
+from app.schemas.calculation import (
+    OPERANDS_ADAPTER,
+    AggregateResponse,
+    BatchCalculationRequest,
+    BatchCalculationResponse,
+    ExpressionRequest,
+    ExpressionResponse,
+    SweepRange,
+    SweepRequest,
+)
+
+router = APIRouter(prefix="/calculate", tags=["Calculator"])
+
+# Table for the single-dispatch route; power maps overflow and domain errors
+# to ValueError (see app/operations/bounded.py).
+STATELESS_OPERATIONS = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+    "power": bounded_power,
+}
+
+# The body is read and validated by hand, so document it explicitly.
+OPERANDS_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": OPERANDS_ADAPTER.json_schema()}},
+    }
+}
+
+
+# ---------------------------
+# Batch evaluation (stateless)
+# ---------------------------
+BATCH_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": BatchCalculationRequest.model_json_schema()},
+            "application/msgpack": {"schema": {"type": "string", "format": "binary"}},
+            RAW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+}
+
+
+def _decode_batch(content_type: str, body: bytes):
+    """Decode any supported batch body into (operations, a, b)."""
+    try:
+        if content_type == RAW_MEDIA_TYPE:
+            return decode_raw_batch(body)
+        if content_type in MSGPACK_MEDIA_TYPES:
+            return decode_msgpack_batch(body)
+    except BatchFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        payload = BatchCalculationRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=_validation_message(e))
+    return payload.operations, payload.a, payload.b
+
+
+@router.post(
+    "/batch",
+    response_model=BatchCalculationResponse,
+    openapi_extra=BATCH_OPENAPI,
+)
+async def calculate_batch(request: Request):
+
+    # JSON stays the default; MessagePack and raw float64 are negotiated via
+    # Content-Type (request) and Accept (response), see batch_formats.py.
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    operations, a, b = _decode_batch(content_type, await request.body())
+
+    if len(a) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.BATCH_MAX_ITEMS} items",
+        )
+
+    # Per-element failures (e.g. divide by zero at index i) are reported in
+    # "errors" rather than failing the whole batch.
+    batch = await run_in_threadpool(evaluate_batch, operations, a, b)
+
+    accept = request.headers.get("accept", "")
+    if RAW_MEDIA_TYPE in accept:
+        return Response(encode_raw_result(batch), media_type=RAW_MEDIA_TYPE)
+    if any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES):
+        return Response(encode_msgpack_result(batch), media_type=MSGPACK_MEDIA_TYPES[0])
+
+    results, errors = batch.to_lists()
+    return ORJSONResponse({"results": results, "errors": errors})
+
+
+# ---------------------------
+# Expression evaluation (stateless)
+# ---------------------------
+@router.post("/expression", response_model=ExpressionResponse)
+def calculate_expression(payload: ExpressionRequest):
+
+    # Parsing happens once per distinct formula; see app.operations.expression.
+    try:
+        result = evaluate_expression(payload.expression, payload.variables)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"expression": payload.expression, "result": result}
+
+
+# ---------------------------
+# NDJSON stream evaluation (stateless)
+# ---------------------------
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that does not listen for disconnects while streaming.
+
+    Starlette's listener consumes receive() messages, which would swallow the
+    request body chunks the generator is still reading. A client that goes
+    away ends the body stream with ClientDisconnect instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post(
+    "/stream",
+    response_class=BodyStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def calculate_stream(request: Request):
+    # Records are read, evaluated and written back incrementally; sending only
+    # proceeds as fast as the client reads, which throttles reading the body.
+    return BodyStreamingResponse(
+        evaluate_ndjson(request.stream(), batch_size=settings.STREAM_BATCH_SIZE),
+        media_type="application/x-ndjson",
+    )
+
+
+# ---------------------------
+# Parameter sweep over a x b (optionally persisted)
+# ---------------------------
+def _sweep_operand(spec: SweepRange) -> np.ndarray:
+    if spec.values is not None:
+        return np.asarray(spec.values, dtype=np.float64)
+    return range_values(spec.start, spec.stop, spec.step)
+
+
+def _sweep_blocks(operation: str, a: np.ndarray, b: np.ndarray):
+    # Failed cells (divide by zero, non-finite power) become NaN: null in JSON.
+    for values, failed in sweep_rows(operation, a, b):
+        values[failed] = np.nan
+        yield values
+
+
+def _sweep_json(operation, a, b, blocks):
+    yield (
+        b'{"operation":' + orjson.dumps(operation)
+        + b',"a":' + orjson.dumps(a, option=orjson.OPT_SERIALIZE_NUMPY)
+        + b',"b":' + orjson.dumps(b, option=orjson.OPT_SERIALIZE_NUMPY)
+        + b',"results":['
+    )
+    separator = b""
+    for block in blocks:
+        # Dump a block of rows as "[..],[..]" by stripping the outer brackets.
+        yield separator + orjson.dumps(block, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1]
+        separator = b","
+    yield b"]}"
+
+
+def _sweep_binary(blocks):
+    for block in blocks:
+        yield block.astype("<f8", copy=False).tobytes()
+
+
+@router.post("/sweep")
+def calculate_sweep(
+    payload: SweepRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Evaluate one operation over the Cartesian grid of a and b. The result is
+    a len(a) x len(b) matrix streamed row-block by row-block, as JSON by
+    default or as raw little-endian float64 (row-major, NaN for failed
+    cells) when the client sends ``Accept: application/octet-stream``.
+    """
+    rows, cols = payload.a.count(), payload.b.count()
+    limit = settings.SWEEP_MAX_PERSIST_CELLS if payload.persist else settings.SWEEP_MAX_CELLS
+    if rows * cols > limit:
+        raise HTTPException(status_code=413, detail=f"Sweep exceeds {limit} cells")
+
+    a, b = _sweep_operand(payload.a), _sweep_operand(payload.b)
+    blocks = _sweep_blocks(payload.operation, a, b)
+    headers = {"X-Sweep-Rows": str(a.shape[0]), "X-Sweep-Cols": str(b.shape[0])}
+
+    if payload.persist:
+        # Evaluate everything up front and write it with one executemany.
+        blocks = list(blocks)
+        grid = np.vstack(blocks)
+        ok = np.isfinite(grid)
+        row_idx, col_idx = np.nonzero(ok)
+        records = [
+            {"operation": payload.operation, "a": x, "b": y, "result": r}
+            for x, y, r in zip(
+                a[row_idx].tolist(), b[col_idx].tolist(), grid[ok].tolist()
+            )
+        ]
+        if records:
+            db.execute(insert(Calculation), records)
+            db.commit()
+        headers["X-Sweep-Persisted"] = str(len(records))
+
+    if "application/octet-stream" in request.headers.get("accept", ""):
+        response = StreamingResponse(
+            _sweep_binary(blocks), media_type="application/octet-stream", headers=headers
+        )
+    else:
+        response = StreamingResponse(
+            _sweep_json(payload.operation, a, b, blocks),
+            media_type="application/json",
+            headers=headers,
+        )
+    if payload.persist:
+        pin_to_primary(response)
+    return response
+
+
+# ---------------------------
+# Streaming aggregates over an uploaded array (optionally persisted)
+# ---------------------------
+def _persist_aggregates(db: Session, count: int, results: dict) -> list:
+    # Aggregates have no (a, b) pair: a records the element count, b is 0.
+    calcs = [
+        Calculation(operation=name, a=float(count), b=0.0, result=value)
+        for name, value in results.items()
+    ]
+    db.add_all(calcs)
+    db.commit()
+    for calc in calcs:
+        db.refresh(calc)
+    return calcs
+
+
+@router.post(
+    "/aggregate",
+    response_model=AggregateResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                RAW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+                "text/plain": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def calculate_aggregate(
+    request: Request,
+    response: Response,
+    ops: list[str] = Query(default=list(AGGREGATES)),
+    persist: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Reduce an uploaded array in one pass without buffering it. The body is
+    raw little-endian float64 (application/octet-stream) or numbers separated
+    by whitespace, commas or newlines (any other content type). Aggregates
+    that are undefined for the input are reported under ``errors`` instead of
+    failing the others.
+    """
+    unknown = [name for name in ops if name not in AGGREGATES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown aggregate: {', '.join(unknown)}")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    decode = decode_float64_chunks if content_type == RAW_MEDIA_TYPE else decode_text_chunks
+
+    aggregate = StreamingAggregate()
+    try:
+        async for values in decode(request.stream()):
+            aggregate.update(values)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results, errors = aggregate.results(ops)
+
+    calculations = None
+    if persist:
+        calculations = await run_in_threadpool(
+            _persist_aggregates, db, aggregate.count, results
+        )
+        pin_to_primary(response)
+
+    return {
+        "count": aggregate.count,
+        "results": results,
+        "errors": errors,
+        "calculations": calculations,
+    }
+
+
+# ---------------------------
+# Single-dispatch binary operation (stateless)
+#
+# Declared last: "/{op}" would otherwise shadow the fixed paths above.
+# ---------------------------
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{err['loc'][-1] if err['loc'] else 'body'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def run_operation(op: str, a: float, b: float) -> float:
+    """Evaluate one stateless operation, mapping calculator errors to HTTP errors."""
+    try:
+        operation_fn = STATELESS_OPERATIONS.get(op)
+        if operation_fn is None:
+            raise HTTPException(status_code=400, detail="Invalid operation")
+        result = operation_fn(a, b)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not math.isfinite(result):
+        raise HTTPException(status_code=400, detail=NOT_FINITE_MESSAGE)
+
+    return result
+
+
+async def calculate_operation(op: str, request: Request) -> ORJSONResponse:
+    """Shared fast path for ``POST /calculate/{op}`` and the legacy routes."""
+    try:
+        operands = OPERANDS_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=_validation_message(e))
+
+    result = run_operation(op, operands["a"], operands["b"])
+    return ORJSONResponse({"result": result})
+
+
+# Results are pure functions of (op, a, b), so GET responses never change:
+# the ETag is derived from the canonical inputs alone and a matching
+# If-None-Match is answered with 304 before anything is computed. Bump
+# ETAG_VERSION if an operation's semantics ever change.
+ETAG_VERSION = "1"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def canonical_query(a: float, b: float) -> str:
+    """Shortest round-tripping float formatting, fixed parameter order."""
+    return urlencode({"a": repr(a), "b": repr(b)})
+
+
+def operation_etag(op: str, query: str) -> str:
+    digest = hashlib.blake2b(
+        f"{ETAG_VERSION}:{op}?{query}".encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+@router.get("/{op}", response_class=ORJSONResponse)
+async def calculate_cacheable(
+    op: str,
+    request: Request,
+    a: float = Query(...),
+    b: float = Query(...),
+):
+    if op not in STATELESS_OPERATIONS:
+        raise HTTPException(status_code=400, detail="Invalid operation")
+
+    query = canonical_query(a, b)
+    cache_headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+
+    # One URL per distinct input so edge caches don't fragment on "2" vs "2.0".
+    if request.scope["query_string"].decode("latin-1") != query:
+        return RedirectResponse(
+            f"{request.url.path}?{query}", status_code=301, headers=cache_headers
+        )
+
+    etag = operation_etag(op, query)
+    cache_headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    result = run_operation(op, a, b)
+    return ORJSONResponse({"result": result}, headers=cache_headers)
+
+
+@router.post(
+    "/{op}",
+    response_class=ORJSONResponse,
+    openapi_extra=OPERANDS_OPENAPI,
+)
+async def calculate(op: str, request: Request):
+    return await calculate_operation(op, request)
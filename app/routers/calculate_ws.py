@@ -0,0 +1,172 @@
+# app/routers/calculate_ws.py
+
+import asyncio
+import math
+from typing import List
+
+import orjson
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.user import USER_BY_ID, User
+from app.operations.vectorized import INVALID_OPERATION_MESSAGE, evaluate_batch, failure_message
+from app.routers.calculate import STATELESS_OPERATIONS
+
+router = APIRouter(prefix="/calculate", tags=["Calculator"])
+
+
+class CorrelatedOperation(TypedDict):
+    id: str | int
+    op: str
+    a: float
+    b: float
+
+
+MESSAGE_ADAPTER = TypeAdapter(CorrelatedOperation)
+
+# Inbox sentinels: the batching window elapsed / the client disconnected.
+_WINDOW_ELAPSED = object()
+_DISCONNECTED = object()
+
+
+def _load_active_user(user_id) -> User | None:
+    db = SessionLocal()
+    try:
+        user = db.scalar(USER_BY_ID, {"user_id": user_id})
+        return user if user and user.is_active else None
+    finally:
+        db.close()
+
+
+async def authenticate_websocket(websocket: WebSocket, token: str | None) -> User | None:
+    """Verify the JWT once for the whole connection (query param or Bearer header)."""
+    if not token:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    user_id = User.verify_token(token) if token else None
+    if not user_id:
+        return None
+    return await run_in_threadpool(_load_active_user, user_id)
+
+
+def _parse(text: str | bytes) -> CorrelatedOperation | dict:
+    """Validated message, or a ready-made error reply."""
+    try:
+        return MESSAGE_ADAPTER.validate_json(text)
+    except ValidationError as e:
+        try:
+            message_id = orjson.loads(text).get("id")
+        except (orjson.JSONDecodeError, AttributeError):
+            message_id = None
+        detail = "; ".join(
+            f"{err['loc'][-1] if err['loc'] else 'message'}: {err['msg']}"
+            for err in e.errors()
+        )
+        return {"id": message_id, "error": detail}
+
+
+def _evaluate_one(message: CorrelatedOperation) -> dict:
+    # Same error text as _evaluate_window, whether or not windows are on.
+    op, a, b = message["op"], message["a"], message["b"]
+    operation_fn = STATELESS_OPERATIONS.get(op)
+    if operation_fn is None:
+        return {"id": message["id"], "error": INVALID_OPERATION_MESSAGE}
+    try:
+        result = operation_fn(a, b)
+    except ValueError:
+        return {"id": message["id"], "error": failure_message(op, b)}
+    if not math.isfinite(result):
+        return {"id": message["id"], "error": failure_message(op, b)}
+    return {"id": message["id"], "result": result}
+
+
+def _evaluate_window(messages: List[CorrelatedOperation]) -> List[dict]:
+    batch = evaluate_batch(
+        [m["op"] for m in messages],
+        [m["a"] for m in messages],
+        [m["b"] for m in messages],
+    )
+    results = batch.results.tolist()
+    replies = []
+    for position, message in enumerate(messages):
+        error = batch.errors.get(position)
+        if error is None:
+            replies.append({"id": message["id"], "result": results[position]})
+        else:
+            replies.append({"id": message["id"], "error": error})
+    return replies
+
+
+# ---------------------------
+# WebSocket calculator channel (authenticated once per connection)
+#
+# Client sends {"id", "op", "a", "b"} messages; each reply carries the same
+# "id" and is sent as soon as the message is evaluated.
+# With window_ms > 0, messages arriving within the window are evaluated
+# together with the vectorized kernels and answered as one JSON array frame.
+# ---------------------------
+@router.websocket("/ws")
+async def calculate_ws(
+    websocket: WebSocket,
+    token: str | None = Query(default=None),
+    window_ms: float = Query(default=0, ge=0, le=1000),
+):
+    user = await authenticate_websocket(websocket, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=settings.WS_MAX_BATCH)
+
+    async def reader():
+        # Bounded inbox: a client that outpaces evaluation stops being read.
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                text = message.get("text")
+                await inbox.put(text if text is not None else message.get("bytes"))
+        finally:
+            await inbox.put(_DISCONNECTED)
+
+    reader_task = asyncio.create_task(reader())
+    loop = asyncio.get_running_loop()
+    window: List[CorrelatedOperation] = []
+    deadline = 0.0
+
+    try:
+        while True:
+            timeout = max(0.0, deadline - loop.time()) if window else None
+            try:
+                raw = await asyncio.wait_for(inbox.get(), timeout)
+            except asyncio.TimeoutError:
+                raw = _WINDOW_ELAPSED
+
+            if raw is _DISCONNECTED:
+                break
+
+            if raw is not _WINDOW_ELAPSED:
+                message = _parse(raw)
+                if "error" in message:
+                    await websocket.send_text(orjson.dumps(message).decode())
+                elif window_ms:
+                    if not window:
+                        deadline = loop.time() + window_ms / 1000
+                    window.append(message)
+                else:
+                    await websocket.send_text(orjson.dumps(_evaluate_one(message)).decode())
+
+            if window and (raw is _WINDOW_ELAPSED or len(window) >= settings.WS_MAX_BATCH):
+                await websocket.send_text(orjson.dumps(_evaluate_window(window)).decode())
+                window = []
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader_task.cancel()
@@ -1,45 +1,279 @@
 # app/routers/calculations.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import csv
+import io
+import math
+from collections import Counter
+from datetime import datetime
+from typing import Literal
+from uuid import UUID, uuid4
 
-from app.database import get_db
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_read_db, get_write_db, read_sessionmaker
+from app.database_bulk import bulk_insert
 from app.schemas.calculation import (
+    CalculationBulkCreate,
+    CalculationBulkResult,
     CalculationCreate,
+    CalculationDagCreate,
+    CalculationFilters,
     CalculationRead,
-    CalculationUpdate
+    CalculationRef,
+    CalculationUpdate,
+    NodeRef,
+)
+from app.models.calculation import (
+    CALCULATION_BY_ID,
+    CALCULATION_OPERANDS_FOR_UPDATE,
+    CALCULATION_RESULTS_BY_IDS,
+    CALCULATIONS_EXPORT,
+    CALCULATIONS_PAGE,
+    CALCULATIONS_PAGE_AFTER,
+    DELETE_CALCULATION,
+    EXPORT_COLUMNS,
+    INSERT_CALCULATION,
+    UPDATE_CALCULATION,
+    Calculation,
 )
-from app.models.calculation import Calculation
-from app.operations import add, subtract, multiply, divide, power
+from app.operations import NOT_FINITE_MESSAGE, add, subtract, multiply, divide
+from app.operations.bounded import bounded_power
+from app.operations.dag import DagError, evaluate_dag, plan_dag, referenced_calculations
+from app.operations.memo import result_cache
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/calculations", tags=["Calculations"])
 
-# NEW: Added "power"
+# NEW: Added "power" (overflow-checked, see app/operations/bounded.py)
 OPERATION_MAP = {
     "add": add,
     "subtract": subtract,
     "multiply": multiply,
     "divide": divide,
-    "power": power,
+    "power": bounded_power,
 }
 
+
+RESULT_CACHE_HEADER = "X-Result-Cache"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def result_cache_mode(
+    x_result_cache: str | None = Header(default=None, alias=RESULT_CACHE_HEADER),
+) -> str:
+    """Send ``X-Result-Cache: bypass`` to skip the memoized results (debugging)."""
+    if not settings.RESULT_CACHE_ENABLED:
+        return "off"
+    if x_result_cache and x_result_cache.lower() == "bypass":
+        return "bypass"
+    return "on"
+
+
+def evaluate(
+    operation: str,
+    a: float,
+    b: float,
+    cache_mode: str = "off",
+    response: Response | None = None,
+) -> float:
+    """Run an OPERATION_MAP entry, mapping calculator errors to HTTP errors."""
+    try:
+        if cache_mode != "on":
+            result = OPERATION_MAP[operation](a, b)
+            status_label = cache_mode.upper()
+        else:
+            result, hit = result_cache.get_or_compute(operation, OPERATION_MAP[operation], a, b)
+            status_label = "HIT" if hit else "MISS"
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if response is not None and cache_mode != "off":
+        response.headers[RESULT_CACHE_HEADER] = status_label
+    return result
+
+
+def _parse_id(calc_id: str) -> UUID | None:
+    try:
+        return UUID(calc_id)
+    except ValueError:
+        return None
+
+
+async def _get_calculation(db: AsyncSession, calc_id: str) -> Calculation | None:
+    calc_uuid = _parse_id(calc_id)
+    if calc_uuid is None:
+        return None
+    return await db.scalar(CALCULATION_BY_ID, {"calc_id": calc_uuid})
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="Calculation not found")
+
+
+_RANGE_FILTERS = [
+    ("a_min", Calculation.a.__ge__),
+    ("a_max", Calculation.a.__le__),
+    ("b_min", Calculation.b.__ge__),
+    ("b_max", Calculation.b.__le__),
+    ("result_min", Calculation.result.__ge__),
+    ("result_max", Calculation.result.__le__),
+    ("created_from", Calculation.created_at.__ge__),
+    ("created_to", Calculation.created_at.__lt__),
+]
+
+
+def calculation_filters(
+    operation: list[str] | None = Query(default=None),
+    a_min: float | None = None,
+    a_max: float | None = None,
+    b_min: float | None = None,
+    b_max: float | None = None,
+    result_min: float | None = None,
+    result_max: float | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    user_id: UUID | None = None,
+) -> CalculationFilters:
+    return CalculationFilters(
+        operation=operation,
+        a_min=a_min,
+        a_max=a_max,
+        b_min=b_min,
+        b_max=b_max,
+        result_min=result_min,
+        result_max=result_max,
+        created_from=created_from,
+        created_to=created_to,
+        user_id=user_id,
+    )
+
+
+def _apply_filters(statement, filters: CalculationFilters):
+    """
+    Add a WHERE predicate per given filter. Each one is served by an index
+    (migrations 0002/0003); operation and user_id lead composite indexes
+    that also carry the (created_at, id) page order.
+    """
+    if filters.operation:
+        statement = statement.where(Calculation.operation.in_(filters.operation))
+    if filters.user_id is not None:
+        statement = statement.where(Calculation.user_id == filters.user_id)
+    for name, predicate in _RANGE_FILTERS:
+        value = getattr(filters, name)
+        if value is not None:
+            statement = statement.where(predicate(value))
+    return statement
+
+
 # ---------------------------
-# Browse ALL calculations (public)
+# Browse calculations, newest first (public)
+#
+# Keyset pages of ``limit`` rows. When there are more, the response carries
+# an X-Next-Cursor header; pass it back as ``?cursor=`` for the next page.
+# ``?all=true`` returns the whole table unpaginated (small tables only).
+# Filters (see CalculationFilters) apply to both.
 # ---------------------------
 @router.get("/", response_model=list[CalculationRead])
-def browse_calculations(db: Session = Depends(get_db)):
-    return db.query(Calculation).all()
+async def browse_calculations(
+    response: Response,
+    filters: CalculationFilters = Depends(calculation_filters),
+    limit: int = Query(default=settings.CALCULATIONS_PAGE_SIZE, ge=1, le=settings.CALCULATIONS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    unpaginated: bool = Query(default=False, alias="all"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if unpaginated:
+        return (await db.scalars(_apply_filters(select(Calculation), filters))).all()
+
+    # One extra row tells whether another page exists.
+    params = {"limit": limit + 1}
+    if cursor is None:
+        statement = CALCULATIONS_PAGE
+    else:
+        try:
+            params["after_created_at"], params["after_id"] = decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        statement = CALCULATIONS_PAGE_AFTER
+
+    calcs = (await db.scalars(_apply_filters(statement, filters), params)).all()
+    if len(calcs) > limit:
+        calcs = calcs[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(calcs[-1].created_at, calcs[-1].id)
+    return calcs
+
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def _ndjson_rows(rows) -> bytes:
+    # default=str covers driver UUID subclasses (asyncpg) that orjson rejects.
+    return b"".join(orjson.dumps(dict(zip(EXPORT_FIELDS, row)), default=str) + b"\n" for row in rows)
+
+
+def _csv_rows(rows) -> bytes:
+    out = io.StringIO()
+    csv.writer(out).writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+    return out.getvalue().encode()
+
+
+async def _stream_export(sessionmaker, statement, encode, header: bytes = b""):
+    # The generator runs after the route has returned, so it cannot borrow a
+    # dependency's session; it opens its own and holds it until the end.
+    if header:
+        yield header
+    async with sessionmaker() as db:
+        result = await db.stream(statement, execution_options={"yield_per": settings.EXPORT_BATCH_SIZE})
+        async for rows in result.partitions():
+            yield encode(rows)
+
+
+# ---------------------------
+# Bulk export (public)
+#
+# Streams the whole table (optionally filtered) as NDJSON or CSV, oldest
+# first. Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time as
+# plain tuples, so worker memory does not grow with the table. Takes the
+# same filters as browsing.
+# ---------------------------
+@router.get("/export")
+async def export_calculations(
+    request: Request,
+    filters: CalculationFilters = Depends(calculation_filters),
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+):
+    statement = _apply_filters(CALCULATIONS_EXPORT, filters)
+
+    if export_format == "csv":
+        header, encode, media_type = ",".join(EXPORT_FIELDS).encode() + b"\r\n", _csv_rows, "text/csv"
+    else:
+        header, encode, media_type = b"", _ndjson_rows, "application/x-ndjson"
+
+    return StreamingResponse(
+        _stream_export(read_sessionmaker(request), statement, encode, header),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="calculations.{export_format}"'},
+    )
 
 
 # ---------------------------
 # Read calculation by ID (public)
 # ---------------------------
 @router.get("/{calc_id}", response_model=CalculationRead)
-def read_calculation(calc_id: str, db: Session = Depends(get_db)):
-    calc = db.query(Calculation).filter(Calculation.id == calc_id).first()
+async def read_calculation(calc_id: str, db: AsyncSession = Depends(get_read_db)):
+    calc = await _get_calculation(db, calc_id)
 
     if not calc:
-        raise HTTPException(status_code=404, detail="Calculation not found")
+        raise _not_found()
 
     return calc
 
@@ -48,63 +282,197 @@ def read_calculation(calc_id: str, db: Session = Depends(get_db)):
 # Create calculation (public)
 # ---------------------------
 @router.post("/", response_model=CalculationRead)
-def create_calculation(payload: CalculationCreate, db: Session = Depends(get_db)):
+async def create_calculation(
+    payload: CalculationCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_write_db),
+    cache_mode: str = Depends(result_cache_mode),
+):
 
     if payload.operation not in OPERATION_MAP:
         raise HTTPException(status_code=400, detail="Invalid operation")
 
-    operation_fn = OPERATION_MAP[payload.operation]
-    result = operation_fn(payload.a, payload.b)
-
-    calc = Calculation(
-        operation=payload.operation,
-        a=payload.a,
-        b=payload.b,
-        result=result,
-        user_id=None,      # tests expect no user for this assignment
-    )
+    result = evaluate(payload.operation, payload.a, payload.b, cache_mode, response)
 
-    db.add(calc)
-    db.commit()
-    db.refresh(calc)
+    # INSERT ... RETURNING: the stored row (id, timestamps) comes back with
+    # the insert itself.
+    calc = await db.scalar(INSERT_CALCULATION, {
+        "operation": payload.operation,
+        "a": payload.a,
+        "b": payload.b,
+        "result": result,
+        "user_id": None,      # tests expect no user for this assignment
+    })
+    await db.commit()
 
     return calc
 
 
+def _dag_operand(operand: float | NodeRef | CalculationRef):
+    if isinstance(operand, NodeRef):
+        return ("node", operand.node)
+    if isinstance(operand, CalculationRef):
+        return ("calculation", operand.calculation)
+    return operand
+
+
+# ---------------------------
+# Create a DAG of chained calculations (public)
+#
+# Operands may be numbers, {"node": id} or {"calculation": uuid}. Identical
+# subexpressions are evaluated and stored once; every node id maps to the
+# calculation that computed it. All rows are written in one transaction.
+# ---------------------------
+def _evaluate_dag_node(operation: str, a: float, b: float) -> float:
+    result = OPERATION_MAP[operation](a, b)
+    if not math.isfinite(result):
+        raise DagError(NOT_FINITE_MESSAGE)
+    return result
+
+
+@router.post("/dag", response_model=dict[str, CalculationRead])
+async def create_calculation_dag(
+    payload: CalculationDagCreate,
+    db: AsyncSession = Depends(get_write_db),
+):
+    nodes = {
+        node_id: (node.operation, _dag_operand(node.a), _dag_operand(node.b))
+        for node_id, node in payload.nodes.items()
+    }
+
+    try:
+        plan = plan_dag(nodes)
+    except DagError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    stored = {}
+    referenced = referenced_calculations(nodes)
+    if referenced:
+        rows = await db.execute(CALCULATION_RESULTS_BY_IDS, {"calc_ids": list(referenced)})
+        stored = dict(rows.all())
+        missing = referenced - stored.keys()
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Calculation not found: {', '.join(sorted(map(str, missing)))}",
+            )
+
+    try:
+        values = evaluate_dag(nodes, plan, stored, _evaluate_dag_node)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    calcs = {
+        node_id: Calculation(operation=operation, a=a, b=b, result=result, user_id=None)
+        for node_id, (operation, a, b, result) in values.items()
+    }
+    db.add_all(calcs.values())
+    await db.commit()
+
+    return {node_id: calcs[plan.canonical[node_id]] for node_id in payload.nodes}
+
+
+BULK_COLUMNS = ("id", "operation", "a", "b", "result", "user_id", "created_at", "updated_at")
+
+
+def _bulk_rows(items: list[CalculationCreate]) -> list[tuple]:
+    # The rows bypass the ORM, so ids and timestamps are filled in here.
+    now = datetime.utcnow()
+    rows = []
+    for index, item in enumerate(items):
+        try:
+            result = OPERATION_MAP[item.operation](item.a, item.b)
+        except ValueError as e:
+            raise ValueError(f"Item {index}: {e}") from e
+        if not math.isfinite(result):
+            raise ValueError(f"Item {index}: {NOT_FINITE_MESSAGE}")
+        rows.append((uuid4(), item.operation, item.a, item.b, result, None, now, now))
+    return rows
+
+
+# ---------------------------
+# Bulk ingest (public)
+#
+# Every item is evaluated before anything is written; the first failing item
+# rejects the whole request. Rows are written in one transaction with COPY on
+# Postgres (batched executemany elsewhere), see app/database_bulk.py.
+# ---------------------------
+@router.post("/bulk", response_model=CalculationBulkResult)
+async def create_calculations_bulk(
+    payload: CalculationBulkCreate,
+    db: AsyncSession = Depends(get_write_db),
+):
+    try:
+        rows = await run_in_threadpool(_bulk_rows, payload.items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await bulk_insert(db, Calculation.__table__, BULK_COLUMNS, rows)
+    await db.commit()
+
+    return {
+        "inserted": len(rows),
+        "operations": dict(Counter(row[1] for row in rows)),
+        "ids": [row[0] for row in rows] if payload.return_ids else None,
+    }
+
+
 # ---------------------------
 # Update calculation (public)
 # ---------------------------
 @router.put("/{calc_id}", response_model=CalculationRead)
 @router.patch("/{calc_id}", response_model=CalculationRead)
-def update_calculation(
+async def update_calculation(
     calc_id: str,
     payload: CalculationUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_write_db),
+    cache_mode: str = Depends(result_cache_mode),
 ):
-    calc = db.query(Calculation).filter(Calculation.id == calc_id).first()
+    calc_uuid = _parse_id(calc_id)
+    if calc_uuid is None:
+        raise _not_found()
 
-    if not calc:
-        raise HTTPException(status_code=404, detail="Calculation not found")
-
-    # Update operation
-    if payload.operation:
-        if payload.operation not in OPERATION_MAP:
-            raise HTTPException(status_code=400, detail="Invalid operation")
-        calc.operation = payload.operation
+    if payload.operation and payload.operation not in OPERATION_MAP:
+        raise HTTPException(status_code=400, detail="Invalid operation")
 
-    # Update numbers
-    if payload.a is not None:
-        calc.a = payload.a
+    if payload.operation and payload.a is not None and payload.b is not None:
+        # Everything the result depends on is in the payload: compute it up
+        # front and write in a single UPDATE ... RETURNING.
+        operation, a, b = payload.operation, payload.a, payload.b
+        try:
+            result = evaluate(operation, a, b, cache_mode, response)
+        except HTTPException:
+            # A missing row still answers 404, as it did before.
+            if await db.scalar(CALCULATION_BY_ID, {"calc_id": calc_uuid}) is None:
+                raise _not_found()
+            raise
+    else:
+        # Partial update: the stored operands are needed to recompute. Lock
+        # the row so a concurrent update cannot slip in between.
+        current = (await db.execute(CALCULATION_OPERANDS_FOR_UPDATE, {"calc_id": calc_uuid})).first()
+        if current is None:
+            raise _not_found()
 
-    if payload.b is not None:
-        calc.b = payload.b
+        operation = payload.operation or current.operation
+        if operation not in OPERATION_MAP:
+            # e.g. persisted aggregates ("sum", "variance", ...) from /calculate/aggregate
+            raise HTTPException(status_code=400, detail="Calculation cannot be recalculated")
 
-    # Recalculate result
-    operation_fn = OPERATION_MAP[calc.operation]
-    calc.result = operation_fn(calc.a, calc.b)
+        a = payload.a if payload.a is not None else current.a
+        b = payload.b if payload.b is not None else current.b
+        result = evaluate(operation, a, b, cache_mode, response)
 
-    db.commit()
-    db.refresh(calc)
+    calc = await db.scalar(UPDATE_CALCULATION, {
+        "calc_id": calc_uuid,
+        "new_operation": operation,
+        "new_a": a,
+        "new_b": b,
+        "new_result": result,
+    })
+    if calc is None:
+        raise _not_found()
+    await db.commit()
 
     return calc
 
@@ -113,14 +481,15 @@ def update_calculation(
 # Delete calculation (public)
 # ---------------------------
 @router.delete("/{calc_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_calculation(calc_id: str, db: Session = Depends(get_db)):
+async def delete_calculation(calc_id: str, db: AsyncSession = Depends(get_write_db)):
 
-    calc = db.query(Calculation).filter(Calculation.id == calc_id).first()
-
-    if not calc:
-        raise HTTPException(status_code=404, detail="Calculation not found")
+    calc_uuid = _parse_id(calc_id)
+    if calc_uuid is None:
+        raise _not_found()
 
-    db.delete(calc)
-    db.commit()
+    deleted = await db.execute(DELETE_CALCULATION, {"calc_id": calc_uuid})
+    if deleted.rowcount == 0:
+        raise _not_found()
+    await db.commit()
 
     return
@@ -0,0 +1,56 @@
+# app/routers/stats.py
+
+from fastapi import APIRouter, Depends
+
+from app.auth.dependencies import get_current_active_user
+
+from app.database import async_engine, engine, replica_engines
+from app.database_pool import pool_stats
+from app.database_queries import query_stats
+from app.operations.expression import expression_cache_info
+from app.operations.memo import result_cache
+
+# Internal counters (SQL fingerprints, timings): signed-in users only, and kept
+# out of the public OpenAPI schema.
+router = APIRouter(
+    prefix="/stats",
+    tags=["Stats"],
+    dependencies=[Depends(get_current_active_user)],
+    include_in_schema=False,
+)
+
+
+# ---------------------------
+# Compiled-expression cache counters
+# ---------------------------
+@router.get("/expressions")
+def expression_stats():
+    return expression_cache_info()
+
+
+# ---------------------------
+# Memoized OPERATION_MAP result counters
+# ---------------------------
+@router.get("/results")
+def result_cache_stats():
+    return result_cache.stats()
+
+
+# ---------------------------
+# Database connection pool usage (this worker)
+# ---------------------------
+@router.get("/pool")
+def connection_pool_stats():
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.sync_engine.pool),
+        "replicas": [pool_stats(replica.sync_engine.pool) for replica in replica_engines],
+    }
+
+
+# ---------------------------
+# SQL fingerprint timings (this worker)
+# ---------------------------
+@router.get("/queries")
+def sql_query_stats():
+    return query_stats.snapshot()
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.schemas.user import UserCreate, UserLogin, Token
 from app.models.user import User
 
@@ -12,12 +12,11 @@ router = APIRouter(prefix="/users", tags=["Users"])
 # REGISTER USER
 # ------------------------------------------------------
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register_user(payload: UserCreate, db: Session = Depends(get_db)):
+async def register_user(payload: UserCreate, db: AsyncSession = Depends(get_async_db)):
 
     try:
-        new_user = User.register(db, payload.model_dump())
-        db.commit()
-        db.refresh(new_user)
+        new_user = await User.register_async(db, payload.model_dump())
+        await db.commit()
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -34,9 +33,9 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)):
 # LOGIN USER
 # ------------------------------------------------------
 @router.post("/login", response_model=Token)
-def login_user(payload: UserLogin, db: Session = Depends(get_db)):
+async def login_user(payload: UserLogin, db: AsyncSession = Depends(get_async_db)):
 
-    auth_result = User.authenticate(db, payload.username, payload.password)
+    auth_result = await User.authenticate_async(db, payload.username, payload.password)
 
     if not auth_result:
         raise HTTPException(
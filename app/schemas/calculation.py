@@ -1,7 +1,11 @@
+import math
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, model_validator
 from typing import Literal
+from typing_extensions import TypedDict
+
+from app.config import settings
 
 
 class CalculationCreate(BaseModel):
@@ -18,6 +22,36 @@ class CalculationUpdate(BaseModel):
     b: float | None = None
 
 
+class CalculationFilters(BaseModel):
+    """
+    Query-string filters shared by browsing and export. Ranges are
+    inclusive; created_from is inclusive and created_to exclusive.
+    Repeat ``operation`` to match any of several operations.
+    """
+    operation: list[str] | None = None
+    a_min: float | None = None
+    a_max: float | None = None
+    b_min: float | None = None
+    b_max: float | None = None
+    result_min: float | None = None
+    result_max: float | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    user_id: UUID | None = None
+
+
+class CalculationBulkCreate(BaseModel):
+    """Calculations inserted together in one transaction (all or nothing)."""
+    items: list[CalculationCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    return_ids: bool = False
+
+
+class CalculationBulkResult(BaseModel):
+    inserted: int
+    operations: dict[str, int]
+    ids: list[UUID] | None = None
+
+
 class CalculationRead(BaseModel):
     id: UUID
     operation: str
@@ -28,3 +62,134 @@ class CalculationRead(BaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BatchCalculationRequest(BaseModel):
+    """Columnar batch: element i is ``operations[i](a[i], b[i])``."""
+    operations: list[str] | str = Field(
+        ..., examples=[["add", "divide", "power"], "multiply"]
+    )
+    a: list[float]
+    b: list[float]
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "BatchCalculationRequest":
+        if len(self.a) != len(self.b):
+            raise ValueError("a and b must have the same length")
+        if not isinstance(self.operations, str) and len(self.operations) != len(self.a):
+            raise ValueError("operations, a and b must have the same length")
+        return self
+
+
+class BatchError(BaseModel):
+    index: int
+    error: str
+
+
+class BatchCalculationResponse(BaseModel):
+    results: list[float | None]
+    errors: list[BatchError]
+
+
+class ExpressionRequest(BaseModel):
+    """A formula such as ``(a + b) ^ c / d`` plus its variable bindings."""
+    expression: str = Field(
+        ..., min_length=1, max_length=settings.EXPRESSION_MAX_LENGTH,
+        examples=["(a + b) ^ c / d"]
+    )
+    variables: dict[str, float] = Field(
+        default_factory=dict, examples=[{"a": 1, "b": 2, "c": 2, "d": 3}]
+    )
+
+
+class ExpressionResponse(BaseModel):
+    expression: str
+    result: float
+
+
+class SweepRange(BaseModel):
+    """Either explicit ``values`` or ``start``/``stop``/``step`` (stop excluded)."""
+    start: float | None = None
+    stop: float | None = None
+    step: float | None = None
+    values: list[float] | None = None
+
+    @model_validator(mode="after")
+    def check_spec(self) -> "SweepRange":
+        bounds = (self.start, self.stop, self.step)
+        if self.values is not None:
+            if any(v is not None for v in bounds):
+                raise ValueError("Give either values or start/stop/step, not both")
+            if not self.values:
+                raise ValueError("values must not be empty")
+            return self
+        if any(v is None for v in bounds):
+            raise ValueError("start, stop and step are all required")
+        if self.step == 0:
+            raise ValueError("step must not be zero")
+        steps = (self.stop - self.start) / self.step
+        if not math.isfinite(steps) or steps <= 0:
+            raise ValueError("step must move start towards stop")
+        return self
+
+    def count(self) -> int:
+        if self.values is not None:
+            return len(self.values)
+        return math.ceil((self.stop - self.start) / self.step)
+
+
+class SweepRequest(BaseModel):
+    """Evaluate one operation over the grid a x b."""
+    operation: Literal["add", "subtract", "multiply", "divide", "power"]
+    a: SweepRange
+    b: SweepRange
+    persist: bool = False
+
+
+class AggregateResponse(BaseModel):
+    count: int
+    results: dict[str, float]
+    # Aggregates that are undefined for this input (e.g. geometric_mean of a
+    # stream containing 0) or do not fit a float64; they are not persisted.
+    errors: dict[str, str] = {}
+    calculations: list[CalculationRead] | None = None
+
+
+class NodeRef(BaseModel):
+    """Operand taken from the result of another node in the same DAG."""
+    node: str
+
+
+class CalculationRef(BaseModel):
+    """Operand taken from the result of an existing calculation."""
+    calculation: UUID
+
+
+class DagNodeCreate(BaseModel):
+    operation: Literal["add", "subtract", "multiply", "divide", "power"]
+    a: float | NodeRef | CalculationRef
+    b: float | NodeRef | CalculationRef
+
+
+class CalculationDagCreate(BaseModel):
+    """Named nodes whose operands may reference other nodes or calculations."""
+    nodes: dict[str, DagNodeCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.DAG_MAX_NODES,
+        examples=[{
+            "sum": {"operation": "add", "a": 1, "b": 2},
+            "squared": {"operation": "multiply", "a": {"node": "sum"}, "b": {"node": "sum"}},
+        }],
+    )
+
+
+class Operands(TypedDict):
+    """Body of the stateless calculator routes: ``{"a": .., "b": ..}``."""
+    a: float
+    b: float
+
+
+# Built once at import; validate_json() parses and validates in pydantic-core
+# without constructing a model instance or running Python-level validators.
+OPERANDS_ADAPTER = TypeAdapter(Operands)
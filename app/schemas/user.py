@@ -14,6 +14,7 @@ class UserCreate(BaseModel):
     username: str = Field(..., max_length=50)
     email: EmailStr
     password: str = Field(..., min_length=6)
+    confirm_password: Optional[str] = None
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -0,0 +1,91 @@
+# benchmarks/bench_bulk_ingest.py
+
+"""
+Rows/sec written through the per-row route (POST /calculations/, one INSERT
+and commit per request) against POST /calculations/bulk (COPY on Postgres,
+executemany elsewhere), driven in-process through the ASGI interface.
+
+Runs against the configured DATABASE_URL, which must be migrated
+(``python -m app.database_init migrate``). The rows it inserts are deleted
+again at the end.
+
+Usage:
+    python -m benchmarks.bench_bulk_ingest [--rows 2000] [--bulk-rows 100000]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import delete
+
+from app.database import async_engine
+from app.models.calculation import Calculation
+from main import app
+
+OPERATIONS = ["add", "subtract", "multiply", "divide", "power"]
+
+
+def items(count: int) -> list[dict]:
+    return [
+        {"operation": OPERATIONS[i % len(OPERATIONS)], "a": i % 1000 + 1.5, "b": 2.0}
+        for i in range(count)
+    ]
+
+
+async def per_row(client: httpx.AsyncClient, rows: list[dict]) -> tuple[float, list[str]]:
+    ids = []
+    start = time.perf_counter()
+    for row in rows:
+        response = await client.post("/calculations/", json=row)
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    return len(rows) / (time.perf_counter() - start), ids
+
+
+async def bulk(client: httpx.AsyncClient, rows: list[dict]) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    response = await client.post("/calculations/bulk", json={"items": rows, "return_ids": True})
+    assert response.status_code == 200, response.text
+    return len(rows) / (time.perf_counter() - start), response.json()["ids"]
+
+
+async def cleanup(ids: list[str]) -> None:
+    async with async_engine.begin() as connection:
+        for start in range(0, len(ids), 10_000):
+            await connection.execute(
+                delete(Calculation).where(Calculation.id.in_(ids[start:start + 10_000]))
+            )
+
+
+async def run(rows: int, bulk_rows: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        created = []
+        try:
+            _, warmup = await per_row(client, items(50))
+            created += warmup
+            before, ids = await per_row(client, items(rows))
+            created += ids
+            after, ids = await bulk(client, items(bulk_rows))
+            created += ids
+        finally:
+            await cleanup(created)
+    await async_engine.dispose()
+
+    print(f"backend: {async_engine.dialect.name}")
+    print(f"before  POST /calculations/      {before:10.0f} rows/s  ({rows} requests)")
+    print(f"after   POST /calculations/bulk  {after:10.0f} rows/s  ({bulk_rows} rows, {after / before:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--bulk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.bulk_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_calculate.py
+
+"""
+Requests/sec of the stateless calculator routes, measured in-process through
+the ASGI interface (no sockets), so the numbers isolate framework, validation
+and serialization overhead from the network.
+
+"before" rebuilds the original /add route: a pydantic model with a
+field_validator as the body and a response_model serialized by FastAPI's
+generic encoder. "after" is POST /calculate/{op} from app/routers/calculate.py.
+
+Usage:
+    python -m benchmarks.bench_calculate [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field, field_validator
+
+from app.operations import add
+from app.routers import calculate
+
+
+class OperationRequest(BaseModel):
+    a: float = Field(..., description="The first number")
+    b: float = Field(..., description="The second number")
+
+    @field_validator('a', 'b')
+    def validate_numbers(cls, value):
+        if not isinstance(value, (int, float)):
+            raise ValueError('Both a and b must be numbers.')
+        return value
+
+
+class OperationResponse(BaseModel):
+    result: float = Field(..., description="The result of the operation")
+
+
+def build_before_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/add", response_model=OperationResponse)
+    async def add_route(operation: OperationRequest):
+        try:
+            result = add(operation.a, operation.b)
+            return OperationResponse(result=result)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return app
+
+
+def build_after_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(calculate.router)
+    return app
+
+
+async def call(app: FastAPI, path: str, body: bytes) -> int:
+    """Drive one request straight through the ASGI interface."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def requests_per_second(app: FastAPI, path: str, n: int) -> float:
+    body = json.dumps({"a": 10.5, "b": 5.25}).encode()
+    for _ in range(500):  # warm-up
+        await call(app, path, body)
+    start = time.perf_counter()
+    for _ in range(n):
+        status = await call(app, path, body)
+    elapsed = time.perf_counter() - start
+    assert status == 200, status
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    before = asyncio.run(requests_per_second(build_before_app(), "/add", args.requests))
+    after = asyncio.run(requests_per_second(build_after_app(), "/calculate/add", args.requests))
+
+    print(f"before  POST /add            {before:10.0f} req/s")
+    print(f"after   POST /calculate/add  {after:10.0f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
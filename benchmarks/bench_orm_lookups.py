@@ -0,0 +1,95 @@
+# benchmarks/bench_orm_lookups.py
+
+"""
+Per-call ORM overhead of the hot lookups, against an in-memory SQLite
+database so the numbers are dominated by statement construction, caching and
+result processing rather than by the database.
+
+"before" builds each query per call, as the routes used to
+(``db.query(Model).filter(...).first()``); "after" executes the prebuilt
+statements from app/models with bound parameters.
+
+Usage:
+    python -m benchmarks.bench_orm_lookups [--calls 20000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy.orm import Session
+
+from app.database import Base, get_engine
+from app.models.calculation import CALCULATION_BY_ID, Calculation
+from app.models.user import USER_BY_ID, USER_BY_LOGIN, User
+
+
+def seed(engine):
+    with Session(engine) as db:
+        user = User(
+            first_name="Bench",
+            last_name="User",
+            email="bench@example.com",
+            username="bench",
+            password_hash="x",
+            is_active=True,
+            is_verified=False,
+        )
+        calc = Calculation(operation="add", a=1, b=2, result=3)
+        db.add_all([user, calc])
+        db.commit()
+        return calc.id, user.id
+
+
+def lookups(calc_id, user_id):
+    return [
+        (
+            "calculation by id",
+            lambda db: db.query(Calculation).filter(Calculation.id == calc_id).first(),
+            lambda db: db.scalar(CALCULATION_BY_ID, {"calc_id": calc_id}),
+        ),
+        (
+            "user by id",
+            lambda db: db.query(User).filter(User.id == user_id).first(),
+            lambda db: db.scalar(USER_BY_ID, {"user_id": user_id}),
+        ),
+        (
+            "user by username/email",
+            lambda db: db.query(User).filter(
+                (User.username == "bench") | (User.email == "bench")
+            ).first(),
+            lambda db: db.scalar(USER_BY_LOGIN, {"login": "bench"}),
+        ),
+    ]
+
+
+def measure(engine, fn, calls: int) -> float:
+    """Mean microseconds per call; the identity map is cleared every call."""
+    with Session(engine) as db:
+        for _ in range(min(calls, 500)):
+            fn(db)
+            db.expunge_all()
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn(db)
+            db.expunge_all()
+        return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = get_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    calc_id, user_id = seed(engine)
+
+    print(f"{'lookup':<24}{'before (us)':>13}{'after (us)':>13}{'speedup':>10}")
+    for name, before, after in lookups(calc_id, user_id):
+        before_us = measure(engine, before, args.calls)
+        after_us = measure(engine, after, args.calls)
+        print(f"{name:<24}{before_us:>13.1f}{after_us:>13.1f}{before_us / after_us:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,21 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 from fastapi.exceptions import RequestValidationError
 
-# Calculator operations
-from app.operations import add, subtract, multiply, divide
-
 # Routers
 from app.routers import auth
 from app.routers import user
 from app.routers import calculations
+from app.routers import calculate
+from app.routers import calculate_ws
+from app.routers import stats
 
 # Database
-from app.database import Base, engine, SessionLocal
-from app.models.user import User
+from app.database import engine, async_engine, replica_engines
+from app.database_queries import QueryRouteMiddleware
+from app.migrations import check_schema_version
 
 import uvicorn
 import logging
@@ -25,35 +26,22 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
+app.add_middleware(QueryRouteMiddleware)
 
 # ---------------------------------------------------------
-# CREATE DATABASE TABLES FIRST (MUST COME BEFORE SEED)
-# ---------------------------------------------------------
-Base.metadata.create_all(bind=engine)
-
-# ---------------------------------------------------------
-# SEED DEFAULT PLAYWRIGHT TEST USER (RUNS AFTER TABLES EXIST)
+# VERIFY THE SCHEMA (migrations and seeding are one-shot commands:
+# `python -m app.database_init migrate` / `seed`, run before workers start)
 # ---------------------------------------------------------
 @app.on_event("startup")
-def seed_test_user():
-    db = SessionLocal()
-    try:
-        existing = db.query(User).filter(User.email == "test@test.com").first()
-        if not existing:
-            user = User(
-                first_name="Test",
-                last_name="User",
-                email="test@test.com",
-                username="test@test.com"
-            )
-            user.password = "password"
-            db.add(user)
-            db.commit()
-            logger.info("Seeded default Playwright test user")
-        else:
-            logger.info("Default test user already exists")
-    finally:
-        db.close()
+def verify_schema_version():
+    check_schema_version(engine)
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    # asyncpg connections belong to this event loop; close them with it.
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
 
 # ---------------------------------------------------------
 # TEMPLATES (Front-end pages)
@@ -81,21 +69,13 @@ async def login_page(request: Request):
 app.include_router(auth.router)
 app.include_router(user.router)
 app.include_router(calculations.router)
+app.include_router(calculate.router)
+app.include_router(calculate_ws.router)
+app.include_router(stats.router)
 
 # ---------------------------------------------------------
 # Calculator Schemas
 # ---------------------------------------------------------
-class OperationRequest(BaseModel):
-    a: float = Field(..., description="The first number")
-    b: float = Field(..., description="The second number")
-
-    @field_validator('a', 'b')
-    def validate_numbers(cls, value):
-        if not isinstance(value, (int, float)):
-            raise ValueError('Both a and b must be numbers.')
-        return value
-
-
 class OperationResponse(BaseModel):
     result: float = Field(..., description="The result of the operation")
 
@@ -131,44 +111,26 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/add", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def add_route(operation: OperationRequest):
-    try:
-        result = add(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except Exception as e:
-        logger.error(f"Add Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/subtract", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def subtract_route(operation: OperationRequest):
-    try:
-        result = subtract(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except Exception as e:
-        logger.error(f"Subtract Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/multiply", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def multiply_route(operation: OperationRequest):
-    try:
-        result = multiply(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except Exception as e:
-        logger.error(f"Multiply Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/divide", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def divide_route(operation: OperationRequest):
-    try:
-        result = divide(operation.a, operation.b)
-        return OperationResponse(result=result)
-    except ValueError as e:
-        logger.error(f"Divide Operation Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Divide Operation Internal Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+# Legacy per-operation routes; thin aliases of POST /calculate/{op}.
+@app.post("/add", response_model=OperationResponse, responses={400: {"model": ErrorResponse}},
+          openapi_extra=calculate.OPERANDS_OPENAPI)
+async def add_route(request: Request):
+    return await calculate.calculate_operation("add", request)
+
+@app.post("/subtract", response_model=OperationResponse, responses={400: {"model": ErrorResponse}},
+          openapi_extra=calculate.OPERANDS_OPENAPI)
+async def subtract_route(request: Request):
+    return await calculate.calculate_operation("subtract", request)
+
+@app.post("/multiply", response_model=OperationResponse, responses={400: {"model": ErrorResponse}},
+          openapi_extra=calculate.OPERANDS_OPENAPI)
+async def multiply_route(request: Request):
+    return await calculate.calculate_operation("multiply", request)
+
+@app.post("/divide", response_model=OperationResponse, responses={400: {"model": ErrorResponse}},
+          openapi_extra=calculate.OPERANDS_OPENAPI)
+async def divide_route(request: Request):
+    return await calculate.calculate_operation("divide", request)
 
 # ---------------------------------------------------------
 # RUN SERVER
@@ -75,12 +75,10 @@ class ServerStartupError(Exception):
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_database(request):
     logger.info("Setting up test database...")
-    Base.metadata.drop_all(bind=test_engine)
+    drop_db()
     logger.info("Dropped all existing tables.")
-    Base.metadata.create_all(bind=test_engine)
-    logger.info("Created all tables based on models.")
     init_db()
-    logger.info("Initialized the test database with initial data.")
+    logger.info("Applied schema migrations.")
     yield
     preserve_db = request.config.getoption("--preserve-db")
     if preserve_db:
@@ -127,6 +125,12 @@ def test_user(db_session: Session) -> User:
     return user
 
 
+@pytest.fixture
+def auth_headers(test_user: User) -> Dict[str, str]:
+    token = User.create_access_token({"sub": str(test_user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
 @pytest.fixture
 def seed_users(db_session: Session, request) -> List[User]:
     try:
@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def registration(fake_user_data):
+    fake_user_data['password'] = 'TestPass123'
+    return fake_user_data
+
+
+def test_register_and_login(client, db_session, registration):
+    response = client.post('/auth/register', json={**registration, 'confirm_password': 'TestPass123'})
+    assert response.status_code == 200
+    assert response.json()['user']['username'] == registration['username']
+
+    for url in ('/auth/login', '/users/login'):
+        login = client.post(url, json={
+            'username': registration['email'],
+            'password': 'TestPass123',
+        })
+        assert login.status_code == 200
+        data = login.json()
+        assert data['token_type'] == 'bearer'
+        assert data['user']['email'] == registration['email']
+
+
+def test_register_password_mismatch(client, db_session, registration):
+    response = client.post('/auth/register', json={**registration, 'confirm_password': 'Other123'})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Passwords do not match'
+
+
+def test_users_register_duplicate(client, db_session, registration):
+    first = client.post('/users/register', json=registration)
+    assert first.status_code == 201
+
+    second = client.post('/users/register', json=registration)
+    assert second.status_code == 400
+    assert second.json()['error'] == 'Username or email already exists'
+
+
+def test_login_wrong_password(client, db_session, registration):
+    client.post('/users/register', json=registration)
+
+    response = client.post('/auth/login', json={
+        'username': registration['username'],
+        'password': 'WrongPass123',
+    })
+    assert response.status_code == 401
@@ -0,0 +1,174 @@
+import struct
+
+import msgpack
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.models.calculation import Calculation
+from main import app
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_batch_api(client):
+    response = client.post('/calculate/batch', json={
+        'operations': ['add', 'subtract', 'multiply', 'divide', 'power'],
+        'a': [10, 10, 10, 10, 2],
+        'b': [5, 5, 5, 2, 3],
+    })
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json() == {'results': [15, 5, 50, 5, 8], 'errors': []}
+
+def test_batch_api_single_operation(client):
+    response = client.post('/calculate/batch', json={'operations': 'multiply', 'a': [1, 2, 3], 'b': [4, 5, 6]})
+    assert response.status_code == 200
+    assert response.json()['results'] == [4, 10, 18]
+
+def test_batch_api_divide_by_zero_does_not_abort(client):
+    response = client.post('/calculate/batch', json={
+        'operations': ['divide', 'divide', 'divide'],
+        'a': [10, 10, 9],
+        'b': [2, 0, 3],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data['results'] == [5, None, 3]
+    assert data['errors'] == [{'index': 1, 'error': 'Cannot divide by zero!'}]
+
+def test_batch_api_length_mismatch(client):
+    response = client.post('/calculate/batch', json={'operations': ['add'], 'a': [1, 2], 'b': [1, 2]})
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+def test_expression_api(client):
+    response = client.post('/calculate/expression', json={
+        'expression': '(a+b)^c/d',
+        'variables': {'a': 1, 'b': 2, 'c': 2, 'd': 3},
+    })
+    assert response.status_code == 200
+    assert response.json()['result'] == 3
+
+def test_expression_api_invalid(client):
+    response = client.post('/calculate/expression', json={'expression': '1 / 0'})
+    assert response.status_code == 400
+    assert "Cannot divide by zero!" in response.json()['error']
+
+def test_expression_api_non_finite(client):
+    for expression, variables in [('a*b', {'a': 1e308, 'b': 10}), ('a^b', {'a': 10, 'b': 400})]:
+        response = client.post('/calculate/expression', json={'expression': expression, 'variables': variables})
+        assert response.status_code == 400
+        assert response.json()['error'] == "Result is not a finite real number"
+
+def test_expression_stats_api(client, auth_headers):
+    client.post('/calculate/expression', json={'expression': 'x * 2', 'variables': {'x': 1}})
+    client.post('/calculate/expression', json={'expression': 'x * 2', 'variables': {'x': 2}})
+    response = client.get('/stats/expressions', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()['hits'] >= 1
+
+def test_stream_api(client):
+    body = b'{"op": "add", "a": 1, "b": 2}\n{"op": "divide", "a": 1, "b": 0}\n'
+    response = client.post('/calculate/stream', content=body,
+                           headers={'Content-Type': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert response.text.splitlines() == [
+        '{"index":0,"result":3.0}',
+        '{"index":1,"error":"Cannot divide by zero!"}',
+    ]
+
+def test_batch_api_raw_float64(client):
+    body = (struct.pack("<4sBBHI", b"CALC", 1, 3, 0, 2)
+            + np.array([10, 1], "<f8").tobytes() + np.array([4, 0], "<f8").tobytes())
+    response = client.post('/calculate/batch', content=body, headers={
+        'Content-Type': 'application/octet-stream',
+        'Accept': 'application/octet-stream',
+    })
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/octet-stream'
+    results = np.frombuffer(response.content, "<f8", count=2, offset=12)
+    status = np.frombuffer(response.content, np.uint8, count=2, offset=28)
+    assert results[0] == 2.5 and np.isnan(results[1])
+    assert status.tolist() == [0, 1]
+
+def test_batch_api_msgpack(client):
+    body = msgpack.packb({'operations': 'power', 'a': [2, 3], 'b': [2, 2]})
+    response = client.post('/calculate/batch', content=body, headers={
+        'Content-Type': 'application/msgpack',
+        'Accept': 'application/msgpack',
+    })
+    assert response.status_code == 200
+    assert msgpack.unpackb(response.content) == {'results': [4.0, 9.0], 'errors': []}
+
+def test_batch_api_msgpack_nested_operands(client):
+    body = msgpack.packb({'operations': 'add', 'a': [[1, 2, 3]], 'b': [[1, 2, 3]]})
+    response = client.post('/calculate/batch', content=body, headers={'Content-Type': 'application/msgpack'})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'a: must be a flat array of numbers'
+
+def test_batch_api_malformed_binary(client):
+    response = client.post('/calculate/batch', content=b'nope',
+                           headers={'Content-Type': 'application/octet-stream'})
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+def test_aggregate_api_text(client):
+    response = client.post('/calculate/aggregate?ops=sum&ops=mean&ops=max',
+                           content=b'1 2 3\n4,5', headers={'Content-Type': 'text/plain'})
+    assert response.status_code == 200
+    assert response.json() == {
+        'count': 5,
+        'results': {'sum': 15, 'mean': 3, 'max': 5},
+        'errors': {},
+        'calculations': None,
+    }
+
+def test_aggregate_api_float64(client):
+    body = np.array([2, 8], '<f8').tobytes()
+    response = client.post('/calculate/aggregate?ops=geometric_mean&ops=variance',
+                           content=body, headers={'Content-Type': 'application/octet-stream'})
+    assert response.status_code == 200
+    assert response.json()['results'] == {'geometric_mean': 4, 'variance': 9}
+
+def test_aggregate_api_unknown_op(client):
+    response = client.post('/calculate/aggregate?ops=median', content=b'1 2')
+    assert response.status_code == 400
+
+def test_aggregate_api_persist(client, db_session):
+    response = client.post('/calculate/aggregate?ops=sum&persist=true', content=b'1 2 3')
+    assert response.status_code == 200
+    [calc] = response.json()['calculations']
+    assert calc['operation'] == 'sum'
+    assert calc['result'] == 6
+
+    read = client.get(f"/calculations/{calc['id']}")
+    assert read.status_code == 200
+    assert read.json()['operation'] == 'sum'
+
+    update = client.patch(f"/calculations/{calc['id']}", json={'a': 1})
+    assert update.status_code == 400
+
+def test_aggregate_api_non_finite_is_not_persisted(client, db_session):
+    response = client.post('/calculate/aggregate?ops=product&ops=sum&persist=true', content=b'1e200 1e200')
+    assert response.status_code == 200
+    assert response.json()['errors'] == {'product': 'product: Result is not a finite real number'}
+    assert [calc['operation'] for calc in response.json()['calculations']] == ['sum']
+    assert db_session.query(Calculation).count() == 1
+
+@pytest.mark.parametrize('body', [b'-1 2 3', b'0 1'])
+def test_aggregate_api_default_ops_with_non_positive_values(client, body):
+    response = client.post('/calculate/aggregate', content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data['errors'] == {'geometric_mean': 'geometric_mean requires strictly positive values'}
+    assert set(data['results']) == {'sum', 'mean', 'variance', 'min', 'max', 'product'}
+
+def test_aggregate_api_empty_body(client):
+    response = client.post('/calculate/aggregate', content=b'')
+    assert response.status_code == 200
+    data = response.json()
+    assert data['count'] == 0
+    assert data['results'] == {'sum': 0, 'product': 1}
+    assert set(data['errors']) == {'mean', 'variance', 'min', 'max', 'geometric_mean'}
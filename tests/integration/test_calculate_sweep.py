@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.calculation import Calculation
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_sweep_json(client):
+    response = client.post('/calculate/sweep', json={
+        'operation': 'power',
+        'a': {'values': [1, 2, 3]},
+        'b': {'start': 0, 'stop': 3, 'step': 1},
+    })
+    assert response.status_code == 200
+    assert response.headers['x-sweep-rows'] == '3'
+    assert response.headers['x-sweep-cols'] == '3'
+    data = response.json()
+    assert data['a'] == [1, 2, 3]
+    assert data['b'] == [0, 1, 2]
+    assert data['results'] == [[1, 1, 1], [1, 2, 4], [1, 3, 9]]
+
+
+def test_sweep_divide_by_zero_cells_are_null(client):
+    response = client.post('/calculate/sweep', json={
+        'operation': 'divide',
+        'a': {'values': [1, 2]},
+        'b': {'values': [0, 2]},
+    })
+    assert response.json()['results'] == [[None, 0.5], [None, 1]]
+
+
+def test_sweep_binary(client):
+    response = client.post(
+        '/calculate/sweep',
+        json={'operation': 'multiply', 'a': {'values': [1, 2]}, 'b': {'values': [3, 4, 5]}},
+        headers={'Accept': 'application/octet-stream'},
+    )
+    assert response.status_code == 200
+    matrix = np.frombuffer(response.content, dtype='<f8').reshape(2, 3)
+    assert matrix.tolist() == [[3, 4, 5], [6, 8, 10]]
+
+
+def test_sweep_too_large(client):
+    response = client.post('/calculate/sweep', json={
+        'operation': 'add',
+        'a': {'start': 0, 'stop': 1e6, 'step': 1},
+        'b': {'start': 0, 'stop': 1e6, 'step': 1},
+    })
+    assert response.status_code == 413
+
+
+def test_sweep_invalid_range(client):
+    response = client.post('/calculate/sweep', json={
+        'operation': 'add',
+        'a': {'start': 0, 'stop': 10, 'step': -1},
+        'b': {'values': [1]},
+    })
+    assert response.status_code == 400
+
+
+def test_sweep_persist(client, db_session):
+    response = client.post('/calculate/sweep', json={
+        'operation': 'divide',
+        'a': {'values': [1, 2]},
+        'b': {'values': [0, 4]},
+        'persist': True,
+    })
+    assert response.status_code == 200
+    assert response.headers['x-sweep-persisted'] == '2'
+
+    rows = db_session.query(Calculation).filter_by(operation='divide').all()
+    assert sorted(row.result for row in rows) == [0.25, 0.5]
@@ -0,0 +1,93 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.models.user import User
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def token(test_user):
+    return User.create_access_token({"sub": str(test_user.id)})
+
+
+def test_ws_rejects_missing_token(client):
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/calculate/ws"):
+            pass
+    assert exc_info.value.code == 1008
+
+
+def test_ws_rejects_invalid_token(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/calculate/ws?token=not-a-jwt"):
+            pass
+
+
+def test_ws_correlated_replies(client, token):
+    with client.websocket_connect(f"/calculate/ws?token={token}") as ws:
+        ws.send_json({"id": 1, "op": "add", "a": 2, "b": 3})
+        ws.send_json({"id": "two", "op": "divide", "a": 1, "b": 0})
+        ws.send_json({"id": 3, "op": "power", "a": 2, "b": 8})
+        ws.send_json({"id": 4, "op": "add", "a": "x", "b": 1})
+
+        replies = {}
+        for _ in range(4):
+            reply = ws.receive_json()
+            replies[reply["id"]] = reply
+
+    assert replies[1] == {"id": 1, "result": 5}
+    assert replies["two"] == {"id": "two", "error": "Cannot divide by zero!"}
+    assert replies[3] == {"id": 3, "result": 256}
+    assert replies[4]["error"].startswith("a:")
+
+
+def test_ws_bearer_header_auth(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    with client.websocket_connect("/calculate/ws", headers=headers) as ws:
+        ws.send_json({"id": 1, "op": "multiply", "a": 6, "b": 7})
+        assert ws.receive_json() == {"id": 1, "result": 42}
+
+
+def test_ws_batching_window(client, token):
+    with client.websocket_connect(f"/calculate/ws?token={token}&window_ms=50") as ws:
+        for i in range(5):
+            ws.send_json({"id": i, "op": "multiply", "a": i, "b": 2})
+
+        received = []
+        while len(received) < 5:
+            frame = ws.receive_json()
+            assert isinstance(frame, list)
+            received.extend(frame)
+
+    assert sorted(r["id"] for r in received) == list(range(5))
+    assert all(r["result"] == r["id"] * 2 for r in received)
+
+
+def test_ws_errors_match_with_and_without_window(client, token):
+    messages = [
+        {"id": 0, "op": "divide", "a": 1, "b": 0},
+        {"id": 1, "op": "power", "a": 10, "b": 400},
+        {"id": 2, "op": "power", "a": -8, "b": 0.5},
+        {"id": 3, "op": "power", "a": 0, "b": -1},
+        {"id": 4, "op": "multiply", "a": 1e308, "b": 10},
+        {"id": 5, "op": "modulo", "a": 1, "b": 2},
+    ]
+
+    def errors(query):
+        with client.websocket_connect(f"/calculate/ws?token={token}{query}") as ws:
+            for message in messages:
+                ws.send_json(message)
+            replies = []
+            while len(replies) < len(messages):
+                frame = ws.receive_json()
+                replies.extend(frame if isinstance(frame, list) else [frame])
+        return {reply["id"]: reply["error"] for reply in replies}
+
+    assert errors("") == errors("&window_ms=50")
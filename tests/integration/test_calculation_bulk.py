@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import async_database_url, engine, get_async_sessionmaker
+from app.database_bulk import bulk_insert
+from app.models.calculation import Calculation
+from app.routers.calculations import BULK_COLUMNS, _bulk_rows
+from app.schemas.calculation import CalculationCreate
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _items(count):
+    operations = ["add", "subtract", "multiply", "divide", "power"]
+    return [{"operation": operations[i % 5], "a": i + 1, "b": 2} for i in range(count)]
+
+
+def test_bulk_insert(client, db_session):
+    response = client.post("/calculations/bulk", json={"items": _items(250)})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "inserted": 250,
+        "operations": {"add": 50, "subtract": 50, "multiply": 50, "divide": 50, "power": 50},
+        "ids": None,
+    }
+    assert db_session.query(Calculation).count() == 250
+    power = db_session.query(Calculation).filter(Calculation.operation == "power", Calculation.a == 5).one()
+    assert power.result == 25
+    assert power.created_at is not None and power.user_id is None
+
+
+def test_bulk_insert_returns_ids(client, db_session):
+    response = client.post("/calculations/bulk", json={"items": _items(3), "return_ids": True})
+
+    ids = response.json()["ids"]
+    assert len(ids) == 3
+    stored = db_session.get(Calculation, uuid.UUID(ids[1]))
+    assert (stored.operation, stored.a, stored.b, stored.result) == ("subtract", 2, 2, 0)
+    assert client.get(f"/calculations/{ids[2]}").json()["result"] == 6
+
+
+def test_bulk_insert_is_all_or_nothing(client, db_session):
+    items = _items(10)
+    items[7] = {"operation": "divide", "a": 1, "b": 0}
+
+    response = client.post("/calculations/bulk", json={"items": items})
+
+    assert response.status_code == 400
+    assert response.json()["error"].startswith("Item 7:")
+    assert db_session.query(Calculation).count() == 0
+
+
+def test_bulk_insert_rejects_non_finite_results(client, db_session):
+    items = _items(10)
+    items[4] = {"operation": "multiply", "a": 1e308, "b": 10}
+
+    response = client.post("/calculations/bulk", json={"items": items})
+
+    assert response.status_code == 400
+    assert response.json()["error"] == "Item 4: Result is not a finite real number"
+    assert db_session.query(Calculation).count() == 0
+
+
+@pytest.mark.parametrize("body", [{"items": []}, {"items": [{"operation": "modulo", "a": 1, "b": 2}]}])
+def test_bulk_insert_validation(client, body):
+    assert client.post("/calculations/bulk", json=body).status_code == 400
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="COPY is Postgres-only")
+def test_copy_rolls_back_with_the_session(db_session):
+    rows = _bulk_rows([CalculationCreate(**item) for item in _items(5)])
+
+    async def copy_then_fail():
+        # NullPool: connections must not outlive this event loop.
+        async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL), poolclass=NullPool
+        )
+        try:
+            async with get_async_sessionmaker(async_engine)() as db:
+                await bulk_insert(db, Calculation.__table__, BULK_COLUMNS, rows)
+                with pytest.raises(DBAPIError):
+                    await db.execute(text("SELECT 1 / 0"))
+                await db.rollback()
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(copy_then_fail())
+    assert db_session.query(Calculation).count() == 0
@@ -0,0 +1,81 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.calculation import Calculation
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_dag_chains_and_deduplicates(client, db_session):
+    response = client.post('/calculations/dag', json={'nodes': {
+        'sum': {'operation': 'add', 'a': 1, 'b': 2},
+        'same_sum': {'operation': 'add', 'a': 2, 'b': 1},
+        'squared': {'operation': 'multiply', 'a': {'node': 'sum'}, 'b': {'node': 'same_sum'}},
+        'half': {'operation': 'divide', 'a': {'node': 'squared'}, 'b': 2},
+    }})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert set(data) == {'sum', 'same_sum', 'squared', 'half'}
+    assert data['sum'] == data['same_sum']
+    assert data['squared']['a'] == 3 and data['squared']['result'] == 9
+    assert data['half']['result'] == 4.5
+    assert db_session.query(Calculation).count() == 3
+
+
+def test_dag_references_existing_calculation(client, db_session):
+    calc = Calculation(operation='add', a=2, b=3, result=5)
+    db_session.add(calc)
+    db_session.commit()
+
+    response = client.post('/calculations/dag', json={'nodes': {
+        'double': {'operation': 'multiply', 'a': {'calculation': str(calc.id)}, 'b': 2},
+    }})
+    assert response.status_code == 200
+    assert response.json()['double']['result'] == 10
+
+
+def test_dag_unknown_calculation(client, db_session):
+    missing = uuid.uuid4()
+    response = client.post('/calculations/dag', json={'nodes': {
+        'x': {'operation': 'add', 'a': {'calculation': str(missing)}, 'b': 1},
+    }})
+    assert response.status_code == 404
+    assert str(missing) in response.json()['error']
+
+
+def test_dag_cycle(client, db_session):
+    response = client.post('/calculations/dag', json={'nodes': {
+        'x': {'operation': 'add', 'a': {'node': 'y'}, 'b': 1},
+        'y': {'operation': 'add', 'a': {'node': 'x'}, 'b': 1},
+    }})
+    assert response.status_code == 400
+    assert 'Cycle' in response.json()['error']
+
+
+def test_dag_failure_persists_nothing(client, db_session):
+    response = client.post('/calculations/dag', json={'nodes': {
+        'ok': {'operation': 'add', 'a': 1, 'b': 1},
+        'bad': {'operation': 'divide', 'a': {'node': 'ok'}, 'b': 0},
+    }})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Node bad: Cannot divide by zero!'
+    assert db_session.query(Calculation).count() == 0
+
+
+def test_dag_non_finite_node_persists_nothing(client, db_session):
+    response = client.post('/calculations/dag', json={'nodes': {
+        'x': {'operation': 'add', 'a': 1e308, 'b': 0},
+        'y': {'operation': 'add', 'a': 0, 'b': 1e308},
+        'product': {'operation': 'multiply', 'a': {'node': 'x'}, 'b': {'node': 'y'}},
+    }})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Node product: Result is not a finite real number'
+    assert db_session.query(Calculation).count() == 0
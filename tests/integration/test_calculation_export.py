@@ -0,0 +1,88 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models.calculation import Calculation
+from main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Several cursor fetches even for a handful of rows.
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def calculations(db_session):
+    start = datetime(2024, 1, 1)
+    calcs = [
+        Calculation(
+            operation="add" if i % 2 else "multiply",
+            a=i, b=2, result=i + 2 if i % 2 else i * 2,
+            created_at=start + timedelta(days=i),
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(calcs)
+    db_session.commit()
+    return calcs
+
+
+def test_export_ndjson(client, calculations):
+    response = client.get("/calculations/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="calculations.ndjson"' in response.headers["content-disposition"]
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["id"] for row in rows] == [str(calc.id) for calc in calculations]
+    assert rows[1] == {
+        "id": str(calculations[1].id),
+        "operation": "add",
+        "a": 1.0,
+        "b": 2.0,
+        "result": 3.0,
+        "user_id": None,
+        "created_at": "2024-01-02T00:00:00",
+        "updated_at": calculations[1].updated_at.isoformat(),
+    }
+
+
+def test_export_csv(client, calculations):
+    response = client.get("/calculations/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [str(calc.id) for calc in calculations]
+    assert rows[0]["operation"] == "multiply"
+    assert float(rows[0]["result"]) == 0.0
+    assert rows[0]["user_id"] == ""
+    assert rows[0]["created_at"] == "2024-01-01T00:00:00"
+
+
+def test_export_filters(client, calculations):
+    response = client.get(
+        "/calculations/export",
+        params={"created_from": "2024-01-02T00:00:00", "created_to": "2024-01-05T00:00:00", "operation": "add"},
+    )
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["id"] for row in rows] == [str(calculations[1].id), str(calculations[3].id)]
+
+
+def test_export_empty(client, db_session):
+    assert client.get("/calculations/export").content == b""
+    assert client.get("/calculations/export?format=csv").text.strip() == (
+        "id,operation,a,b,result,user_id,created_at,updated_at"
+    )
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/calculations/export?format=xml").status_code == 400
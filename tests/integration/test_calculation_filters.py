@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+
+from app.database import engine
+from app.migrations.m0003_calculations_filter_indexes import INDEXES
+from app.models.calculation import Calculation
+from app.models.user import User
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def user(db_session):
+    user = User(
+        first_name="Filter", last_name="User", email="filter@example.com",
+        username="filter", password_hash="x", is_active=True, is_verified=False,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def calculations(db_session, user):
+    start = datetime(2024, 1, 1)
+    calcs = {}
+    for day, (operation, a, b, result, owner) in enumerate([
+        ("add", 1, 2, 3, None),
+        ("multiply", 3, 4, 12, user.id),
+        ("add", 10, 5, 15, user.id),
+        ("divide", 9, 3, 3, None),
+        ("subtract", 8, 2, 6, user.id),
+    ]):
+        calc = Calculation(operation=operation, a=a, b=b, result=result, user_id=owner,
+                           created_at=start + timedelta(days=day))
+        db_session.add(calc)
+        calcs[day] = calc
+    db_session.commit()
+    return calcs
+
+
+def _days(response, calculations):
+    assert response.status_code == 200, response.text
+    by_id = {str(calc.id): day for day, calc in calculations.items()}
+    return [by_id[calc["id"]] for calc in response.json()]
+
+
+@pytest.mark.parametrize("params, days", [
+    ({"operation": "add"}, [2, 0]),
+    ({"operation": ["add", "divide"]}, [3, 2, 0]),
+    ({"a_min": 3, "a_max": 9}, [4, 3, 1]),
+    ({"b_max": 2}, [4, 0]),
+    ({"result_min": 12}, [2, 1]),
+    ({"created_from": "2024-01-02T00:00:00", "created_to": "2024-01-04T00:00:00"}, [2, 1]),
+    ({"operation": "add", "result_min": 4}, [2]),
+    ({"operation": "divide", "a_min": 100}, []),
+])
+def test_browse_filters(client, calculations, params, days):
+    assert _days(client.get("/calculations/", params=params), calculations) == days
+
+
+def test_browse_filter_by_user(client, calculations, user):
+    response = client.get("/calculations/", params={"user_id": str(user.id), "operation": "add"})
+    assert _days(response, calculations) == [2]
+    assert _days(client.get("/calculations/", params={"user_id": str(uuid.uuid4())}), calculations) == []
+
+
+def test_filters_apply_across_pages(client, calculations, user):
+    params = {"user_id": str(user.id), "limit": 2}
+    first = client.get("/calculations/", params=params)
+    second = client.get("/calculations/", params={**params, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert _days(first, calculations) == [4, 2]
+    assert _days(second, calculations) == [1]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_filters_apply_to_unpaginated_and_export(client, calculations):
+    assert sorted(_days(client.get("/calculations/?all=true&b_min=4"), calculations)) == [1, 2]
+
+    response = client.get("/calculations/export", params={"result_max": 6})
+    exported = [orjson.loads(line)["id"] for line in response.content.splitlines()]
+    assert exported == [str(calculations[day].id) for day in (0, 3, 4)]
+
+
+@pytest.mark.parametrize("params", [{"a_min": "lots"}, {"user_id": "nobody"}, {"created_from": "yesterday"}])
+def test_invalid_filters(client, params):
+    assert client.get("/calculations/", params=params).status_code == 400
+
+
+def test_filter_indexes_exist():
+    indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes("calculations")}
+    for name, columns in INDEXES:
+        assert indexes[name] == columns
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+
+from app.database import engine
+from app.models.calculation import Calculation
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def calculations(db_session):
+    start = datetime(2024, 1, 1)
+    # Pairs share a created_at, so the id tie-break is exercised too.
+    calcs = [
+        Calculation(operation="add", a=i, b=0, result=i, created_at=start + timedelta(seconds=i // 2))
+        for i in range(7)
+    ]
+    db_session.add_all(calcs)
+    db_session.commit()
+    return sorted(calcs, key=lambda calc: (calc.created_at, calc.id), reverse=True)
+
+
+def _ids(response):
+    return [calc["id"] for calc in response.json()]
+
+
+def test_pages_walk_the_table_once(client, calculations):
+    seen = []
+    url = "/calculations/?limit=3"
+    while True:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()) <= 3
+        seen += _ids(response)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        url = f"/calculations/?limit=3&cursor={cursor}"
+
+    assert seen == [str(calc.id) for calc in calculations]
+
+
+def test_last_page_has_no_cursor(client, calculations):
+    response = client.get("/calculations/?limit=7")
+    assert len(response.json()) == 7
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_default_page_size(client, calculations):
+    response = client.get("/calculations/")
+    assert len(response.json()) == 7
+
+
+def test_unpaginated_opt_in(client, calculations):
+    response = client.get("/calculations/?all=true&limit=1")
+    assert len(response.json()) == 7
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=501"])
+def test_page_size_is_bounded(client, query):
+    assert client.get(f"/calculations/?{query}").status_code == 400
+
+
+def test_invalid_cursor(client):
+    response = client.get("/calculations/?cursor=garbage")
+    assert response.status_code == 400
+    assert response.json() == {"error": "Invalid cursor"}
+
+
+def test_keyset_index_exists():
+    indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes("calculations")}
+    assert indexes["ix_calculations_created_at_id"] == ["created_at", "id"]
@@ -0,0 +1,94 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database_queries import query_stats
+from app.models.calculation import Calculation
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _statements():
+    return [row['fingerprint'].split()[0] for row in query_stats.snapshot()['fingerprints']
+            for _ in range(row['count'])]
+
+
+def _create(client, **payload):
+    response = client.post('/calculations/', json=payload)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_create_is_a_single_insert(client, db_session):
+    query_stats.clear()
+    data = _create(client, operation='multiply', a=3, b=4)
+
+    assert _statements() == ['INSERT']
+    assert data['result'] == 12
+    assert data['created_at'] and data['updated_at']
+    assert db_session.get(Calculation, uuid.UUID(data['id'])).result == 12
+
+
+def test_full_update_is_a_single_update(client, db_session):
+    calc_id = _create(client, operation='add', a=1, b=2)['id']
+
+    query_stats.clear()
+    response = client.put(f'/calculations/{calc_id}', json={'operation': 'divide', 'a': 9, 'b': 3})
+
+    assert response.status_code == 200
+    assert _statements() == ['UPDATE']
+    assert response.json()['operation'] == 'divide'
+    assert response.json()['result'] == 3
+    assert db_session.get(Calculation, uuid.UUID(calc_id)).result == 3
+
+
+def test_partial_update_recomputes_from_stored_operands(client, db_session):
+    calc_id = _create(client, operation='subtract', a=10, b=4)['id']
+
+    query_stats.clear()
+    response = client.patch(f'/calculations/{calc_id}', json={'b': 1})
+
+    assert response.status_code == 200
+    assert sorted(_statements()) == ['SELECT', 'UPDATE']
+    assert response.json()['a'] == 10
+    assert response.json()['result'] == 9
+
+
+def test_update_error_precedence_is_unchanged(client, db_session):
+    missing = str(uuid.uuid4())
+    assert client.put(f'/calculations/{missing}', json={'operation': 'divide', 'a': 1, 'b': 0}).status_code == 404
+    assert client.patch(f'/calculations/{missing}', json={'a': 1}).status_code == 404
+    assert client.patch('/calculations/not-a-uuid', json={'a': 1}).status_code == 404
+
+    calc_id = _create(client, operation='add', a=1, b=2)['id']
+    response = client.put(f'/calculations/{calc_id}', json={'operation': 'divide', 'a': 1, 'b': 0})
+    assert response.status_code == 400
+    assert db_session.get(Calculation, uuid.UUID(calc_id)).result == 3
+
+
+def test_aggregate_rows_cannot_be_recalculated(client, db_session):
+    calc = Calculation(operation='sum', a=0, b=0, result=6)
+    db_session.add(calc)
+    db_session.commit()
+
+    response = client.patch(f'/calculations/{calc.id}', json={'a': 1})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Calculation cannot be recalculated'
+
+
+def test_delete_uses_rowcount(client, db_session):
+    calc_id = _create(client, operation='add', a=1, b=2)['id']
+
+    query_stats.clear()
+    assert client.delete(f'/calculations/{calc_id}').status_code == 204
+    assert _statements() == ['DELETE']
+
+    assert client.delete(f'/calculations/{calc_id}').status_code == 404
+    assert client.delete('/calculations/not-a-uuid').status_code == 404
+    assert db_session.query(Calculation).count() == 0
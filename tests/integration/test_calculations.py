@@ -61,6 +61,19 @@ def test_create_power_calculation(fastapi_server, db_session):
     assert calc.result == 16.0
 
 
+# ---------------------------------------------------------
+# CREATE Calculation with calculator error
+# ---------------------------------------------------------
+def test_create_divide_by_zero_calculation(fastapi_server):
+    url = f"{BASE_URL}/calculations/"
+    payload = {"operation": "divide", "a": 1, "b": 0}
+
+    response = requests.post(url, json=payload)
+
+    assert response.status_code == 400
+    assert "Cannot divide by zero!" in response.json()["error"]
+
+
 # ---------------------------------------------------------
 # READ Calculation
 # ---------------------------------------------------------
@@ -0,0 +1,54 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_pool_stats_count_async_checkouts(client, db_session, auth_headers):
+    before = client.get('/stats/pool', headers=auth_headers).json()
+
+    client.get('/calculations/')
+    after = client.get('/stats/pool', headers=auth_headers).json()
+
+    assert set(after) == {'sync', 'async', 'replicas'}
+    assert after['async']['checkouts'] == before['async']['checkouts'] + 1
+    assert after['async']['checked_out'] == 0
+    assert after['async']['pool_size'] >= 1
+    assert after['sync']['wait_ms_total'] >= 0
+
+
+def test_query_stats_fingerprint_requests(client, db_session, auth_headers):
+    client.get('/calculations/')
+
+    stats = client.get('/stats/queries', headers=auth_headers).json()
+
+    select_calculations = [
+        row for row in stats['fingerprints']
+        if row['fingerprint'].startswith('SELECT calculations.id')
+    ]
+    assert select_calculations and select_calculations[0]['count'] >= 1
+    assert select_calculations[0]['p99_ms'] >= select_calculations[0]['p50_ms']
+
+
+def test_stats_require_a_token_and_stay_out_of_the_schema(client, db_session):
+    for path in ('/stats/pool', '/stats/queries', '/stats/results', '/stats/expressions'):
+        assert client.get(path).status_code == 401
+
+    assert not [path for path in client.get('/openapi.json').json()['paths'] if path.startswith('/stats')]
+
+
+def test_slow_queries_are_logged_with_route(client, db_session, monkeypatch, caplog):
+    monkeypatch.setattr('app.database_queries.settings.SLOW_QUERY_MS', 0)
+
+    with caplog.at_level(logging.WARNING, logger='app.slow_query'):
+        client.get('/calculations/')
+
+    assert '[GET /calculations/]' in caplog.text
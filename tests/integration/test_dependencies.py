@@ -1,9 +1,9 @@
 import pytest
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import MagicMock, patch
 from fastapi import HTTPException, status
 from app.auth.dependencies import get_current_user, get_current_active_user
 from app.schemas.user import UserResponse
-from app.models.user import User
+from app.models.user import USER_BY_ID, User
 from uuid import uuid4
 from datetime import datetime
 
@@ -42,7 +42,7 @@ def mock_verify_token():
 
 def test_get_current_user_valid_token_existing_user(mock_db, mock_verify_token):
     mock_verify_token.return_value = sample_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = sample_user
+    mock_db.scalar.return_value = sample_user
 
     user_response = get_current_user(db=mock_db, token="validtoken")
 
@@ -58,9 +58,7 @@ def test_get_current_user_valid_token_existing_user(mock_db, mock_verify_token):
     assert user_response.updated_at == sample_user.updated_at
 
     mock_verify_token.assert_called_once_with("validtoken")
-    mock_db.query.assert_called_once_with(User)
-    mock_db.query.return_value.filter.assert_called_once_with(ANY)
-    mock_db.query.return_value.filter.return_value.first.assert_called_once()
+    mock_db.scalar.assert_called_once_with(USER_BY_ID, {"user_id": sample_user.id})
 
 def test_get_current_user_invalid_token(mock_db, mock_verify_token):
     mock_verify_token.return_value = None
@@ -72,11 +70,11 @@ def test_get_current_user_invalid_token(mock_db, mock_verify_token):
     assert exc_info.value.detail == "Could not validate credentials"
 
     mock_verify_token.assert_called_once_with("invalidtoken")
-    mock_db.query.assert_not_called()
+    mock_db.scalar.assert_not_called()
 
 def test_get_current_user_valid_token_nonexistent_user(mock_db, mock_verify_token):
     mock_verify_token.return_value = sample_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.scalar.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
         get_current_user(db=mock_db, token="validtoken")
@@ -85,13 +83,11 @@ def test_get_current_user_valid_token_nonexistent_user(mock_db, mock_verify_toke
     assert exc_info.value.detail == "Could not validate credentials"
 
     mock_verify_token.assert_called_once_with("validtoken")
-    mock_db.query.assert_called_once_with(User)
-    mock_db.query.return_value.filter.assert_called_once_with(ANY)
-    mock_db.query.return_value.filter.return_value.first.assert_called_once()
+    mock_db.scalar.assert_called_once_with(USER_BY_ID, {"user_id": sample_user.id})
 
 def test_get_current_active_user_active(mock_db, mock_verify_token):
     mock_verify_token.return_value = sample_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = sample_user
+    mock_db.scalar.return_value = sample_user
 
     current_user = get_current_user(db=mock_db, token="validtoken")
     active_user = get_current_active_user(current_user=current_user)
@@ -101,7 +97,7 @@ def test_get_current_active_user_active(mock_db, mock_verify_token):
 
 def test_get_current_active_user_inactive(mock_db, mock_verify_token):
     mock_verify_token.return_value = inactive_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = inactive_user
+    mock_db.scalar.return_value = inactive_user
 
     current_user = get_current_user(db=mock_db, token="validtoken")
 
@@ -32,4 +32,71 @@ def test_divide_by_zero_api(client):
     assert response.status_code == 400, f"Expected status code 400, got {response.status_code}"
     assert 'error' in response.json(), "Response JSON does not contain 'error' field"
     assert "Cannot divide by zero!" in response.json()['error'], \
-        f"Expected error message 'Cannot divide by zero!', got '{response.json()['error']}'"
\ No newline at end of file
+        f"Expected error message 'Cannot divide by zero!', got '{response.json()['error']}'"
+
+
+@pytest.mark.parametrize(
+    "op, expected",
+    [("add", 15), ("subtract", 5), ("multiply", 50), ("divide", 2), ("power", 100000)],
+)
+def test_calculate_op_api(client, op, expected):
+    response = client.post(f'/calculate/{op}', json={'a': 10, 'b': 5})
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.json() == {'result': expected}
+
+
+def test_calculate_unknown_op_api(client):
+    response = client.post('/calculate/modulo', json={'a': 10, 'b': 5})
+    assert response.status_code == 400
+    assert response.json()['error'] == "Invalid operation"
+
+
+def test_calculate_invalid_operand_api(client):
+    response = client.post('/calculate/add', json={'a': 'ten', 'b': 5})
+    assert response.status_code == 400
+    assert response.json()['error'].startswith("a:")
+
+
+def test_calculate_missing_body_api(client):
+    response = client.post('/calculate/add', content=b'')
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_calculate_non_finite_result_api(client):
+    response = client.post('/calculate/multiply', json={'a': 1e308, 'b': 10})
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_calculate_get_is_cacheable(client):
+    response = client.get('/calculate/add?a=10.0&b=5.0')
+    assert response.status_code == 200
+    assert response.json() == {'result': 15}
+    assert 'immutable' in response.headers['cache-control']
+    assert response.headers['etag'].startswith('"')
+
+
+def test_calculate_get_redirects_to_canonical_url(client):
+    response = client.get('/calculate/add?b=5&a=10', follow_redirects=False)
+    assert response.status_code == 301
+    assert response.headers['location'] == '/calculate/add?a=10.0&b=5.0'
+
+
+def test_calculate_get_if_none_match(client):
+    etag = client.get('/calculate/power?a=2.0&b=10.0').headers['etag']
+
+    response = client.get('/calculate/power?a=2.0&b=10.0', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+    assert response.content == b''
+
+    other = client.get('/calculate/power?a=2.0&b=11.0', headers={'If-None-Match': etag})
+    assert other.status_code == 200
+    assert other.headers['etag'] != etag
+
+
+def test_calculate_get_divide_by_zero(client):
+    response = client.get('/calculate/divide?a=1.0&b=0.0')
+    assert response.status_code == 400
+    assert "Cannot divide by zero!" in response.json()['error']
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.database import Base, engine, get_engine
+from app.database_init import seed_test_user
+from app.migrations import (
+    SCHEMA_VERSION,
+    SchemaVersionError,
+    check_schema_version,
+    current_version,
+    migrate,
+    runner,
+    schema_version,
+)
+from app.migrations.ops import create_index
+from app.models.user import User
+
+
+@pytest.fixture
+def fresh_engine(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_check_fails_before_migrate(fresh_engine):
+    with pytest.raises(SchemaVersionError, match="python -m app.database_init migrate"):
+        check_schema_version(fresh_engine)
+
+
+def test_check_reports_unreachable_database(tmp_path):
+    unreachable = get_engine(f"sqlite:///{tmp_path / 'missing' / 'app.db'}")
+    with pytest.raises(OperationalError):
+        check_schema_version(unreachable)
+
+
+def test_migrate_builds_schema_once(fresh_engine):
+    assert migrate(fresh_engine) == list(range(1, SCHEMA_VERSION + 1))
+    assert migrate(fresh_engine) == []
+
+    assert check_schema_version(fresh_engine) == SCHEMA_VERSION
+    tables = set(inspect(fresh_engine).get_table_names())
+    assert {"users", "calculations", "schema_version"} <= tables
+
+
+def test_migrate_adopts_schema_from_create_all(fresh_engine):
+    Base.metadata.create_all(bind=fresh_engine)
+
+    assert migrate(fresh_engine)[0] == 1
+    assert check_schema_version(fresh_engine) == SCHEMA_VERSION
+
+
+def test_migrate_in_memory_database():
+    memory_engine = get_engine("sqlite://")
+    try:
+        assert migrate(memory_engine) == list(range(1, SCHEMA_VERSION + 1))
+        assert check_schema_version(memory_engine) == SCHEMA_VERSION
+        indexes = {index["name"] for index in inspect(memory_engine).get_indexes("calculations")}
+        assert "ix_calculations_operation_created_at_id" in indexes
+    finally:
+        memory_engine.dispose()
+
+
+def test_failed_transactional_migration_is_rolled_back(fresh_engine, monkeypatch):
+    migrate(fresh_engine)
+
+    def upgrade(connection):
+        connection.execute(delete(schema_version))
+        raise RuntimeError("boom")
+
+    broken = SimpleNamespace(
+        __name__="m9999_broken", VERSION=SCHEMA_VERSION + 1, TRANSACTIONAL=True, upgrade=upgrade,
+    )
+    monkeypatch.setattr(runner, "MIGRATIONS", [*runner.MIGRATIONS, broken])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        migrate(fresh_engine)
+    with fresh_engine.connect() as connection:
+        assert current_version(connection) == SCHEMA_VERSION
+
+
+def test_create_index_is_idempotent(fresh_engine):
+    migrate(fresh_engine)
+    with fresh_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        create_index(connection, "ix_test_operation", "calculations", ["operation"])
+        create_index(connection, "ix_test_operation", "calculations", ["operation"])
+
+    indexes = {index["name"] for index in inspect(fresh_engine).get_indexes("calculations")}
+    assert "ix_test_operation" in indexes
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="CONCURRENTLY is Postgres-only")
+def test_create_index_rebuilds_invalid_index():
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("CREATE TABLE ix_scratch (x INTEGER)"))
+        try:
+            connection.execute(text("INSERT INTO ix_scratch VALUES (1), (1)"))
+            with pytest.raises(IntegrityError):
+                create_index(connection, "ix_scratch_x", "ix_scratch", ["x"], unique=True)
+
+            connection.execute(text("DELETE FROM ix_scratch"))
+            create_index(connection, "ix_scratch_x", "ix_scratch", ["x"], unique=True)
+
+            assert connection.scalar(text(
+                "SELECT indisvalid FROM pg_index WHERE indexrelid = 'ix_scratch_x'::regclass"
+            )) is True
+        finally:
+            connection.execute(text("DROP TABLE ix_scratch"))
+
+
+def test_test_database_is_migrated():
+    assert check_schema_version(engine) == SCHEMA_VERSION
+
+
+def test_seed_is_idempotent(db_session):
+    assert seed_test_user() is True
+    assert seed_test_user() is False
+    assert db_session.query(User).filter(User.email == "test@test.com").count() == 1
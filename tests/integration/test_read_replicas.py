@@ -0,0 +1,105 @@
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+import app.database as database
+from app.config import settings
+from app.database import Base, PRIMARY_PIN_COOKIE, async_database_url, get_async_sessionmaker
+from app.models.calculation import Calculation
+from main import app
+
+
+@pytest.fixture(scope="module")
+def replica_url():
+    """A second database (Postgres) or file (SQLite) stands in for a replica."""
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        root, extension = os.path.splitext(url.database)
+        url = url.set(database=f"{root}_replica{extension}")
+    else:
+        url = url.set(database=f"{url.database}_replica")
+        admin = create_engine(settings.DATABASE_URL, isolation_level="AUTOCOMMIT")
+        with admin.connect() as connection:
+            exists = connection.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": url.database}
+            )
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{url.database}"'))
+        admin.dispose()
+
+    replica = create_engine(url)
+    Base.metadata.drop_all(bind=replica)
+    Base.metadata.create_all(bind=replica)
+    with Session(replica) as session:
+        session.add(Calculation(operation="add", a=100, b=11, result=111))
+        session.commit()
+    yield url.render_as_string(hide_password=False)
+    Base.metadata.drop_all(bind=replica)
+    replica.dispose()
+
+
+@pytest.fixture
+def client(replica_url, monkeypatch, db_session):
+    # NullPool: connections must not outlive the TestClient's event loop.
+    replica_engine = create_async_engine(async_database_url(replica_url), poolclass=NullPool)
+    monkeypatch.setattr(database, "ReplicaSessionLocals", [get_async_sessionmaker(replica_engine)])
+    with TestClient(app) as client:
+        yield client
+
+
+def _results(response):
+    return [calc["result"] for calc in response.json()]
+
+
+def test_reads_go_to_replica_by_default(client):
+    response = client.get("/calculations/")
+    assert response.status_code == 200
+    assert _results(response) == [111]
+
+
+def test_reads_after_write_stay_on_primary(client):
+    created = client.post("/calculations/", json={"operation": "add", "a": 1, "b": 2})
+    assert created.status_code == 200
+    assert PRIMARY_PIN_COOKIE in created.cookies
+
+    assert _results(client.get("/calculations/")) == [3]
+    read = client.get(f"/calculations/{created.json()['id']}")
+    assert read.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "path, request_kwargs",
+    [
+        (
+            "/calculate/sweep",
+            {"json": {"operation": "add", "a": {"values": [1]}, "b": {"values": [2]}, "persist": True}},
+        ),
+        ("/calculate/aggregate?ops=sum&persist=true", {"content": b"1 2"}),
+    ],
+    ids=["sweep", "aggregate"],
+)
+def test_persisting_calculate_routes_pin_reads_to_primary(client, path, request_kwargs):
+    written = client.post(path, **request_kwargs)
+    assert written.status_code == 200
+    assert PRIMARY_PIN_COOKIE in written.cookies
+
+    assert _results(client.get("/calculations/")) == [3]
+
+
+def test_expired_pin_returns_to_replica(client):
+    client.cookies.set(PRIMARY_PIN_COOKIE, f"{time.time() - 1:.3f}")
+    assert _results(client.get("/calculations/")) == [111]
+
+
+def test_no_cookie_without_replicas(monkeypatch, db_session):
+    monkeypatch.setattr(database, "ReplicaSessionLocals", [])
+    with TestClient(app) as client:
+        created = client.post("/calculations/", json={"operation": "add", "a": 1, "b": 2})
+    assert PRIMARY_PIN_COOKIE not in created.cookies
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.operations.memo import result_cache
+from main import app
+
+
+@pytest.fixture
+def client(monkeypatch, db_session):
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+    result_cache.clear()
+    with TestClient(app) as client:
+        yield client
+    result_cache.clear()
+
+
+def test_create_calculation_uses_result_cache(client, auth_headers):
+    payload = {"operation": "power", "a": 2, "b": 8}
+
+    first = client.post("/calculations/", json=payload)
+    second = client.post("/calculations/", json=payload)
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert first.headers["X-Result-Cache"] == "MISS"
+    assert second.headers["X-Result-Cache"] == "HIT"
+    assert second.json()["result"] == 256
+
+    stats = client.get("/stats/results", headers=auth_headers).json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_bypass_header_skips_result_cache(client):
+    payload = {"operation": "multiply", "a": 3, "b": 7}
+    client.post("/calculations/", json=payload)
+
+    response = client.post("/calculations/", json=payload, headers={"X-Result-Cache": "bypass"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Result-Cache"] == "BYPASS"
+    assert result_cache.hits == 0
+
+
+def test_update_calculation_uses_result_cache(client):
+    created = client.post("/calculations/", json={"operation": "add", "a": 1, "b": 2}).json()
+
+    response = client.patch(f"/calculations/{created['id']}", json={"a": 1})
+
+    assert response.status_code == 200
+    assert response.headers["X-Result-Cache"] == "HIT"
+    assert response.json()["result"] == 3
@@ -0,0 +1,108 @@
+# tests/unit/test_aggregates.py
+
+import asyncio
+import math
+import statistics
+
+import numpy as np
+import pytest
+
+from app.operations.aggregates import (
+    AGGREGATES,
+    StreamingAggregate,
+    decode_float64_chunks,
+    decode_text_chunks,
+)
+
+
+def _aggregate(values, chunk_size):
+    aggregate = StreamingAggregate()
+    values = np.asarray(values, dtype=np.float64)
+    for start in range(0, len(values), chunk_size):
+        aggregate.update(values[start:start + chunk_size])
+    return aggregate
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_aggregates_match_reference(chunk_size):
+    rng = np.random.default_rng(1234)
+    values = rng.uniform(0.5, 2.0, size=2500)
+
+    results, errors = _aggregate(values, chunk_size).results(AGGREGATES)
+
+    assert errors == {}
+    assert results["sum"] == pytest.approx(math.fsum(values), rel=1e-14)
+    assert results["mean"] == pytest.approx(statistics.fmean(values), rel=1e-14)
+    assert results["variance"] == pytest.approx(statistics.pvariance(values), rel=1e-10)
+    assert results["min"] == values.min()
+    assert results["max"] == values.max()
+    assert results["product"] == pytest.approx(math.prod(values), rel=1e-10)
+    assert results["geometric_mean"] == pytest.approx(statistics.geometric_mean(values), rel=1e-10)
+
+
+def test_compensated_sum_keeps_small_terms():
+    values = [1e16] + [1.0] * 10_000 + [-1e16]
+    assert _aggregate(values, chunk_size=1).result("sum") == 10_000.0
+
+
+def test_product_does_not_overflow_in_between():
+    values = [1e300, 1e300, 1e-300, 1e-300, 3.0]
+    assert _aggregate(values, chunk_size=2).result("product") == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("name", ["product", "sum", "mean"])
+def test_non_finite_results_are_rejected(name):
+    aggregate = _aggregate([1e200, 1e200] if name == "product" else [1.7e308, 1.7e308], chunk_size=1)
+    with pytest.raises(ValueError, match=f"{name}: Result is not a finite real number"):
+        aggregate.result(name)
+
+
+def test_geometric_mean_requires_positive_values():
+    with pytest.raises(ValueError, match="strictly positive"):
+        _aggregate([1.0, 0.0, 2.0], chunk_size=2).result("geometric_mean")
+
+
+def test_undefined_aggregates_are_reported_per_name():
+    results, errors = _aggregate([-1.0, 2.0, 3.0], chunk_size=2).results(AGGREGATES)
+
+    assert errors == {"geometric_mean": "geometric_mean requires strictly positive values"}
+    assert results["sum"] == 4.0
+    assert results["min"] == -1.0
+
+
+def test_empty_stream():
+    aggregate = StreamingAggregate()
+    assert aggregate.result("sum") == 0.0
+    assert aggregate.result("product") == 1.0
+    with pytest.raises(ValueError):
+        aggregate.result("mean")
+
+
+def test_non_finite_values_are_rejected():
+    with pytest.raises(ValueError):
+        StreamingAggregate().update(np.array([1.0, np.nan]))
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def _collect(decoder, *parts):
+    async def run():
+        return [values async for values in decoder(_chunks(*parts))]
+    return np.concatenate(asyncio.run(run()))
+
+
+def test_decode_float64_across_chunk_boundaries():
+    body = np.arange(5, dtype="<f8").tobytes()
+    assert _collect(decode_float64_chunks, body[:5], body[5:21], body[21:]).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_decode_text_across_chunk_boundaries():
+    assert _collect(decode_text_chunks, b"1.5, 2", b"5\n-3", b"e2 4").tolist() == [1.5, 25, -300, 4]
+
+
+def test_decode_text_rejects_garbage():
+    with pytest.raises(ValueError, match="Invalid number"):
+        _collect(decode_text_chunks, b"1 two 3")
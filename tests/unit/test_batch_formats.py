@@ -0,0 +1,105 @@
+# tests/unit/test_batch_formats.py
+
+import struct
+
+import msgpack
+import numpy as np
+import pytest
+
+from app.operations.batch_formats import (
+    BatchFormatError,
+    PER_ELEMENT_OP,
+    STATUS_MESSAGES,
+    decode_msgpack_batch,
+    decode_raw_batch,
+    encode_msgpack_result,
+    encode_raw_result,
+)
+from app.operations.vectorized import OPERATION_NAMES, evaluate_batch
+
+
+def raw_request(op, a, b, codes=None):
+    header = struct.pack("<4sBBHI", b"CALC", 1, op, 0, len(a))
+    body = header + np.asarray(a, "<f8").tobytes() + np.asarray(b, "<f8").tobytes()
+    if codes is not None:
+        body += np.asarray(codes, np.uint8).tobytes()
+    return body
+
+
+def parse_raw_response(body):
+    magic, version, count = struct.unpack_from("<4sB3xI", body)
+    assert (magic, version) == (b"CALR", 1)
+    results = np.frombuffer(body, "<f8", count=count, offset=12)
+    status = np.frombuffer(body, np.uint8, count=count, offset=12 + 8 * count)
+    return results, status
+
+
+def test_raw_single_operation_is_zero_copy():
+    body = raw_request(OPERATION_NAMES.index("multiply"), [1, 2, 3], [4, 5, 6])
+
+    operations, a, b = decode_raw_batch(body)
+
+    assert operations == "multiply"
+    assert not a.flags.owndata and not b.flags.owndata
+    assert evaluate_batch(operations, a, b).results.tolist() == [4, 10, 18]
+
+
+def test_raw_per_element_codes_round_trip():
+    codes = [OPERATION_NAMES.index(name) for name in ("add", "divide", "power")] + [42]
+    body = raw_request(PER_ELEMENT_OP, [1, 1, 2, 1], [2, 0, 3, 1], codes)
+
+    batch = evaluate_batch(*decode_raw_batch(body))
+    results, status = parse_raw_response(encode_raw_result(batch))
+
+    assert results[0] == 3 and results[2] == 8
+    assert np.isnan(results[1]) and np.isnan(results[3])
+    assert [STATUS_MESSAGES[s] for s in status] == [
+        "", "Cannot divide by zero!", "", "Invalid operation",
+    ]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"CAL",
+        struct.pack("<4sBBHI", b"XXXX", 1, 0, 0, 0),
+        struct.pack("<4sBBHI", b"CALC", 1, 0, 0, 2) + b"\0" * 8,
+        struct.pack("<4sBBHI", b"CALC", 1, 9, 0, 0),
+    ],
+    ids=["short_header", "bad_magic", "truncated_operands", "unknown_operation"],
+)
+def test_raw_malformed_bodies(body):
+    with pytest.raises(BatchFormatError):
+        decode_raw_batch(body)
+
+
+def test_msgpack_accepts_arrays_and_float64_bins():
+    body = msgpack.packb({
+        "operations": ["add", "subtract"],
+        "a": np.array([5.0, 5.0], "<f8").tobytes(),
+        "b": [1, 2],
+    })
+
+    operations, a, b = decode_msgpack_batch(body)
+    batch = evaluate_batch(operations, a, b)
+
+    assert msgpack.unpackb(encode_msgpack_result(batch)) == {
+        "results": [6.0, 3.0], "errors": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [1, 2, 3],
+        {"operations": "add", "a": [1]},
+        {"operations": "add", "a": [1, 2], "b": [1]},
+        {"operations": "add", "a": b"\0" * 7, "b": [1]},
+        {"operations": "add", "a": ["x"], "b": [1]},
+        {"operations": "add", "a": [[1, 2]], "b": [1]},
+        {"operations": ["add"], "a": [1, 2], "b": [1, 2]},
+    ],
+)
+def test_msgpack_malformed_bodies(payload):
+    with pytest.raises(BatchFormatError):
+        decode_msgpack_batch(msgpack.packb(payload))
@@ -0,0 +1,30 @@
+# tests/unit/test_bounded_power.py
+
+import pytest
+
+from app.operations.bounded import bounded_power
+
+
+def test_power_runs_inline():
+    assert bounded_power(2.0, 10.0) == 1024
+    assert bounded_power(9.0, 0.5) == 3.0
+
+
+def test_large_float_exponent_is_cheap():
+    assert bounded_power(1.0, 1e18) == 1.0
+    assert bounded_power(0.5, 1e18) == 0.0
+
+
+def test_float_overflow_is_a_value_error():
+    with pytest.raises(ValueError, match="Result too large"):
+        bounded_power(3.0, 100_000_000.0)
+
+
+def test_zero_to_negative_power_is_a_value_error():
+    with pytest.raises(ValueError, match="zero to a negative power"):
+        bounded_power(0.0, -1.0)
+
+
+def test_complex_result_is_a_value_error():
+    with pytest.raises(ValueError, match="not a real number"):
+        bounded_power(-8.0, 0.5)
@@ -0,0 +1,114 @@
+# tests/unit/test_dag.py
+
+import time
+import uuid
+
+import pytest
+
+from app.operations import add, divide, multiply
+from app.operations.dag import (
+    DagError,
+    evaluate_dag,
+    plan_dag,
+    referenced_calculations,
+    topological_order,
+)
+
+FUNCTIONS = {"add": add, "multiply": multiply, "divide": divide}
+
+
+def _run(operation, a, b):
+    return FUNCTIONS[operation](a, b)
+
+
+def test_topological_order_puts_dependencies_first():
+    nodes = {
+        "total": ("add", ("node", "left"), ("node", "right")),
+        "left": ("multiply", 2, 3),
+        "right": ("add", ("node", "left"), 1),
+    }
+    order = topological_order(nodes)
+    assert order.index("left") < order.index("right") < order.index("total")
+
+
+def test_cycle_is_rejected():
+    nodes = {
+        "x": ("add", ("node", "y"), 1),
+        "y": ("add", ("node", "x"), 1),
+        "z": ("add", 1, 1),
+    }
+    with pytest.raises(DagError, match="Cycle detected between nodes: x, y"):
+        plan_dag(nodes)
+
+
+def test_self_reference_is_a_cycle():
+    with pytest.raises(DagError, match="Cycle"):
+        plan_dag({"x": ("add", ("node", "x"), 1)})
+
+
+def test_unknown_node_is_rejected():
+    with pytest.raises(DagError, match="Node x references unknown node missing"):
+        plan_dag({"x": ("add", ("node", "missing"), 1)})
+
+
+def test_common_subexpressions_share_a_canonical_node():
+    nodes = {
+        "s1": ("add", 1, 2),
+        "s2": ("add", 2, 1),          # commutative duplicate
+        "d1": ("divide", 1, 2),
+        "d2": ("divide", 2, 1),       # not commutative
+        "p1": ("multiply", ("node", "s1"), ("node", "d1")),
+        "p2": ("multiply", ("node", "s2"), ("node", "d1")),  # duplicate through refs
+    }
+    plan = plan_dag(nodes)
+    assert plan.canonical["s2"] == "s1"
+    assert plan.canonical["p2"] == "p1"
+    assert plan.canonical["d2"] == "d2"
+    assert plan.order == ["s1", "d1", "d2", "p1"]
+
+
+def test_deep_doubling_chain_plans_in_linear_time():
+    nodes = {"n0": ("add", 1, 1)}
+    for i in range(1, 1000):
+        nodes[f"n{i}"] = ("multiply", ("node", f"n{i - 1}"), ("node", f"n{i - 1}"))
+    nodes["dup"] = ("multiply", ("node", "n998"), ("node", "n998"))
+
+    start = time.perf_counter()
+    plan = plan_dag(nodes)
+
+    assert time.perf_counter() - start < 1.0
+    assert len(plan.order) == 1000
+    assert plan.canonical["dup"] == "n999"
+
+
+def test_equal_values_with_different_bits_are_not_merged():
+    plan = plan_dag({"x": ("add", 0.0, 1), "y": ("add", -0.0, 1)})
+    assert plan.order == ["x", "y"]
+
+
+def test_evaluate_dag_resolves_nodes_and_calculations():
+    stored = uuid.uuid4()
+    nodes = {
+        "sum": ("add", ("calculation", stored), 2),
+        "squared": ("multiply", ("node", "sum"), ("node", "sum")),
+        "again": ("add", 2, ("calculation", stored)),
+    }
+    plan = plan_dag(nodes)
+    assert referenced_calculations(nodes) == {stored}
+
+    calls = []
+
+    def counting(operation, a, b):
+        calls.append(operation)
+        return _run(operation, a, b)
+
+    values = evaluate_dag(nodes, plan, {stored: 3.0}, counting)
+
+    assert values == {"sum": ("add", 3.0, 2, 5.0), "squared": ("multiply", 5.0, 5.0, 25.0)}
+    assert calls == ["add", "multiply"]
+
+
+def test_evaluate_dag_names_the_failing_node():
+    nodes = {"zero": ("add", 0, 0), "ratio": ("divide", 1, ("node", "zero"))}
+    with pytest.raises(DagError, match="Node ratio: Cannot divide by zero!"):
+        evaluate_dag(nodes, plan_dag(nodes), {}, _run)
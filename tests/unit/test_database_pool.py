@@ -0,0 +1,89 @@
+# tests/unit/test_database_pool.py
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.database_pool import MeteredQueuePool, instrument_pool, pool_options, pool_stats
+
+
+def _engine(pool_size=1, max_overflow=1, pool_timeout=0.05):
+    engine = create_engine(
+        "sqlite://",
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+    instrument_pool(engine.pool)
+    return engine
+
+
+def test_pool_options_without_budget(monkeypatch):
+    monkeypatch.setattr("app.database_pool.settings.DB_MAX_CONNECTIONS", 0)
+    monkeypatch.setattr("app.database_pool.settings.DB_POOL_SIZE", 7)
+    monkeypatch.setattr("app.database_pool.settings.DB_MAX_OVERFLOW", 3)
+
+    options = pool_options()
+
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+
+
+@pytest.mark.parametrize("budget, workers, expected", [
+    (100, 4, (5, 7)),     # 12 per engine: configured pool_size plus overflow
+    (16, 4, (2, 0)),      # tight budget shrinks the pool itself
+    (1, 4, (1, 0)),       # never below one connection
+])
+def test_pool_options_split_budget(monkeypatch, budget, workers, expected):
+    monkeypatch.setattr("app.database_pool.settings.DB_MAX_CONNECTIONS", budget)
+    monkeypatch.setattr("app.database_pool.settings.WEB_CONCURRENCY", workers)
+    monkeypatch.setattr("app.database_pool.settings.DB_POOL_SIZE", 5)
+    monkeypatch.setattr("app.database_pool.settings.DB_MAX_OVERFLOW", 10)
+
+    options = pool_options()
+
+    assert (options["pool_size"], options["max_overflow"]) == expected
+
+
+def test_checkouts_overflow_and_checkins_are_counted():
+    engine = _engine()
+
+    first = engine.connect()
+    second = engine.connect()
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["overflow_checkouts"] == 1
+    assert stats["connects"] == 2
+
+    first.close()
+    second.close()
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["checkins"] == 2
+
+
+def test_exhausted_pool_records_timeout_and_wait():
+    engine = _engine(max_overflow=0)
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine.pool)
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 50
+
+
+def test_metrics_survive_dispose():
+    engine = _engine()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert pool_stats(engine.pool)["checkouts"] == 2
@@ -0,0 +1,98 @@
+# tests/unit/test_database_queries.py
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.database_queries import (
+    QueryStats,
+    current_scope,
+    fingerprint,
+    instrument_engine,
+)
+
+
+@pytest.mark.parametrize("statement, expected", [
+    (
+        "SELECT * FROM users WHERE id = %(id_1)s AND email = 'a@b.c'",
+        "SELECT * FROM users WHERE id = ? AND email = ?",
+    ),
+    (
+        "SELECT id FROM calculations WHERE id IN ($1, $2, $3)",
+        "SELECT id FROM calculations WHERE id IN (?)",
+    ),
+    (
+        "SELECT  a::text,\n t1.b FROM t1 -- trailing\n LIMIT 10 OFFSET 2.5",
+        "SELECT a::text, t1.b FROM t1 LIMIT ? OFFSET ?",
+    ),
+    (
+        "INSERT INTO t (a, b) VALUES (?, ?)",
+        "INSERT INTO t (a, b) VALUES (?)",
+    ),
+])
+def test_fingerprint_normalizes_values(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+def test_same_shape_shares_a_fingerprint():
+    assert fingerprint("SELECT * FROM t WHERE x = 5") == fingerprint("SELECT * FROM t WHERE x = -7.25")
+
+
+def test_stats_percentiles_and_cap():
+    stats = QueryStats(max_fingerprints=1, window=100)
+    for ms in range(1, 101):
+        stats.record("SELECT 1", ms / 1000)
+    stats.record("SELECT other FROM t", 0.5)
+
+    snapshot = stats.snapshot()
+    [row] = snapshot["fingerprints"]
+    assert row["count"] == 100
+    assert row["p50_ms"] == 50
+    assert row["p99_ms"] == 99
+    assert row["max_ms"] == 100
+    assert snapshot["untracked"] == 1
+
+
+def test_window_keeps_recent_timings_only():
+    stats = QueryStats(max_fingerprints=10, window=2)
+    for seconds in (1.0, 0.001, 0.002):
+        stats.record("SELECT 1", seconds)
+
+    [row] = stats.snapshot()["fingerprints"]
+    assert row["count"] == 3
+    assert row["p99_ms"] == 2
+    assert row["max_ms"] == 1000
+
+
+def test_engine_listeners_record_and_log_slow_queries(monkeypatch, caplog):
+    monkeypatch.setattr("app.database_queries.settings.SLOW_QUERY_MS", 0)
+    stats = QueryStats(max_fingerprints=10, window=10)
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, stats)
+
+    token = current_scope.set({"type": "http", "method": "GET", "path": "/calculations/"})
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT :value"), {"value": 42})
+                connection.execute(text("SELECT :value"), {"value": 43})
+    finally:
+        current_scope.reset(token)
+
+    [row] = stats.snapshot()["fingerprints"]
+    assert row["fingerprint"] == "SELECT ?"
+    assert row["count"] == 2
+    assert "[GET /calculations/]" in caplog.text
+    assert "(42,)" in caplog.text
+
+
+def test_failed_statement_does_not_leak_timers():
+    stats = QueryStats(max_fingerprints=10, window=10)
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, stats)
+
+    with engine.connect() as connection:
+        with pytest.raises(Exception):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info["query_start"] == []
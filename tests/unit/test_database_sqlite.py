@@ -0,0 +1,62 @@
+# tests/unit/test_database_sqlite.py
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, insert, select, text
+from sqlalchemy.pool import StaticPool
+
+from app.database import get_async_engine, get_engine
+from app.models.types import GUID
+
+
+def test_file_database_gets_wal_and_pragmas(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    with engine.connect() as connection:
+        assert connection.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert connection.scalar(text("PRAGMA synchronous")) == 1   # NORMAL
+        assert connection.scalar(text("PRAGMA foreign_keys")) == 1
+        assert connection.scalar(text("PRAGMA cache_size")) == -64_000
+        assert connection.scalar(text("PRAGMA busy_timeout")) == 5000
+    engine.dispose()
+
+
+def test_async_engine_gets_the_same_pragmas(tmp_path):
+    async def journal_mode():
+        engine = get_async_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        try:
+            async with engine.connect() as connection:
+                return await connection.scalar(text("PRAGMA journal_mode"))
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(journal_mode()) == "wal"
+
+
+def test_memory_database_shares_one_connection():
+    engine = get_engine("sqlite://")
+    assert isinstance(engine.pool, StaticPool)
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT count(*) FROM t")) == 0
+
+
+def test_async_engine_rejects_memory_database():
+    with pytest.raises(ValueError, match="In-memory SQLite is not supported"):
+        get_async_engine("sqlite://")
+
+
+def test_guid_round_trips_and_accepts_strings():
+    engine = get_engine("sqlite://")
+    table = Table("things", MetaData(), Column("id", GUID(), primary_key=True))
+    table.create(engine)
+    value = uuid.uuid4()
+
+    with engine.begin() as connection:
+        connection.execute(insert(table), {"id": value})
+        assert connection.scalar(select(table.c.id)) == value
+        assert connection.scalar(select(table.c.id).where(table.c.id == str(value))) == value
@@ -0,0 +1,94 @@
+# tests/unit/test_expression.py
+
+import pytest
+
+from app.operations.expression import (
+    ExpressionError,
+    clear_expression_cache,
+    compile_expression,
+    evaluate_expression,
+    expression_cache_info,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_expression_cache()
+    yield
+    clear_expression_cache()
+
+
+@pytest.mark.parametrize(
+    "expression, variables, expected",
+    [
+        ("(a+b)^c/d", {"a": 1, "b": 2, "c": 2, "d": 3}, 3.0),
+        ("2 + 3 * 4", {}, 14.0),
+        ("2 ^ 3 ^ 2", {}, 512.0),
+        ("-2 ^ 2", {}, -4.0),
+        ("2 ** -1", {}, 0.5),
+        ("x * (y - 1.5e1)", {"x": 2, "y": 20}, 10.0),
+    ],
+    ids=[
+        "chained_formula",
+        "precedence",
+        "power_is_right_associative",
+        "unary_minus_binds_looser_than_power",
+        "double_star_alias",
+        "scientific_literal",
+    ]
+)
+def test_evaluate_expression(expression, variables, expected):
+    assert evaluate_expression(expression, variables) == expected
+
+
+def test_repeated_formula_hits_cache():
+    evaluate_expression("(a + b) * c", {"a": 1, "b": 2, "c": 3})
+    evaluate_expression("  (a +  b) *\tc ", {"a": 4, "b": 5, "c": 6})
+
+    info = expression_cache_info()
+    assert info["misses"] == 1
+    assert info["hits"] == 1
+    assert info["size"] == 1
+
+
+def test_compiled_expression_reports_variables():
+    compiled = compile_expression("a / (b - c) + 1")
+    assert compiled.variables == frozenset({"a", "b", "c"})
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["", "1 +", "(1 + 2", "1 2", "__import__('os')", "a.b", "1 % 2", "(" * 200 + "1" + ")" * 200],
+)
+def test_invalid_expressions_raise(expression):
+    with pytest.raises(ExpressionError):
+        compile_expression(expression)
+
+
+def test_unbound_variable_raises():
+    with pytest.raises(ExpressionError, match="Unbound variable"):
+        evaluate_expression("a + b", {"a": 1})
+
+
+def test_divide_by_zero_raises_value_error():
+    with pytest.raises(ValueError, match="Cannot divide by zero!"):
+        evaluate_expression("a / (b - b)", {"a": 1, "b": 2})
+
+
+def test_complex_result_is_rejected():
+    with pytest.raises(ExpressionError):
+        evaluate_expression("a ^ 0.5", {"a": -4})
+
+
+@pytest.mark.parametrize(
+    "expression, variables",
+    [
+        ("a * b", {"a": 1e308, "b": 10}),
+        ("a ^ b", {"a": 10, "b": 400}),
+        ("1e308 * 10", {}),
+    ],
+    ids=["infinite_product", "power_overflow", "folded_constant"],
+)
+def test_non_finite_result_is_rejected(expression, variables):
+    with pytest.raises(ExpressionError, match="Result is not a finite real number"):
+        evaluate_expression(expression, variables)
@@ -0,0 +1,24 @@
+# tests/unit/test_pagination.py
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    row_id = uuid.uuid4()
+
+    token = encode_cursor(created_at, row_id)
+
+    assert "=" not in token
+    assert decode_cursor(token) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("token", ["", "not a cursor", "bm90LWEtY3Vyc29y", encode_cursor(datetime(2024, 1, 1), uuid.uuid4())[:-4]])
+def test_invalid_cursor(token):
+    with pytest.raises(InvalidCursor, match="Invalid cursor"):
+        decode_cursor(token)
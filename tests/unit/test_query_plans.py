@@ -0,0 +1,85 @@
+# tests/unit/test_query_plans.py
+
+import hashlib
+import json
+
+from benchmarks.bench_query_plans import BASELINES, budget, check_plan, seeded_id, summarize_plan
+
+
+def _explain(plan, execution_time=1.5):
+    return [{"Plan": plan, "Planning Time": 0.1, "Execution Time": execution_time}]
+
+
+INDEX_PAGE = _explain({
+    "Node Type": "Limit",
+    "Shared Hit Blocks": 6,
+    "Shared Read Blocks": 2,
+    "Plans": [{
+        "Node Type": "Index Scan",
+        "Relation Name": "calculations",
+        "Index Name": "ix_calculations_created_at_id",
+    }],
+})
+
+SEQ_SCAN_JOIN = _explain({
+    "Node Type": "Hash Join",
+    "Shared Hit Blocks": 900,
+    "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": "calculations"},
+        {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "schema_version"}]},
+    ],
+}, execution_time=250.0)
+
+
+def test_summarize_plan():
+    assert summarize_plan(INDEX_PAGE) == {
+        "seq_scans": [],
+        "indexes": ["ix_calculations_created_at_id"],
+        "time_ms": 1.5,
+        "buffers": 8,
+    }
+    assert summarize_plan(SEQ_SCAN_JOIN)["seq_scans"] == ["calculations", "schema_version"]
+
+
+def test_plan_within_its_own_budget():
+    summary = summarize_plan(INDEX_PAGE)
+    baseline = budget(summary)
+
+    assert baseline["max_time_ms"] == 4.5
+    assert baseline["max_buffers"] == 58
+    assert check_plan(summary, baseline) == []
+
+
+def test_regressions_are_reported():
+    baseline = budget(summarize_plan(INDEX_PAGE))
+    problems = check_plan(summarize_plan(SEQ_SCAN_JOIN), baseline)
+
+    assert problems == [
+        "sequential scan on calculations",
+        "250.00 ms exceeds budget of 4.5 ms",
+        "900 buffers exceed budget of 58",
+    ]
+
+
+def test_full_reads_may_seq_scan():
+    summary = summarize_plan(SEQ_SCAN_JOIN)
+    assert check_plan(summary, budget(summary), full_scan=True) == []
+
+
+def test_new_query_needs_a_baseline():
+    assert check_plan(summarize_plan(INDEX_PAGE), None) == [
+        "no baseline (run with --update and commit query_plans.json)"
+    ]
+
+
+def test_seeded_ids_match_seed_sql():
+    assert seeded_id("calc", 42).hex == hashlib.md5(b"calc42").hexdigest()
+
+
+def test_committed_baselines_have_no_seq_scans():
+    baselines = json.loads(BASELINES.read_text())
+    assert baselines["dataset"]["calculations"] >= 1_000_000
+    for key, entry in baselines["queries"].items():
+        if not entry["full_scan"]:
+            assert not set(entry["seq_scans"]) & {"users", "calculations"}, key
+        assert entry["max_time_ms"] >= entry["time_ms"] and entry["max_buffers"] >= entry["buffers"]
@@ -0,0 +1,70 @@
+# tests/unit/test_result_cache.py
+
+import time
+
+import pytest
+
+from app.operations import divide, power
+from app.operations.memo import ResultCache, result_key
+
+
+class CountingOperation:
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, a, b):
+        self.calls += 1
+        return self.fn(a, b)
+
+
+def test_repeated_triple_is_served_from_cache():
+    cache = ResultCache(max_size=10)
+    op = CountingOperation(power)
+
+    assert cache.get_or_compute("power", op, 2.0, 10.0) == (1024.0, False)
+    assert cache.get_or_compute("power", op, 2.0, 10.0) == (1024.0, True)
+
+    assert op.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_uses_exact_float_bits():
+    assert result_key("add", 0.0, 1.0) != result_key("add", -0.0, 1.0)
+    assert result_key("add", 0.1 + 0.2, 1.0) != result_key("add", 0.3, 1.0)
+    assert result_key("add", 1.0, 2.0) != result_key("subtract", 1.0, 2.0)
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_size=2)
+    op = CountingOperation(power)
+
+    cache.get_or_compute("power", op, 2.0, 1.0)
+    cache.get_or_compute("power", op, 2.0, 2.0)
+    cache.get_or_compute("power", op, 2.0, 1.0)  # refresh (2, 1)
+    cache.get_or_compute("power", op, 2.0, 3.0)  # evicts (2, 2)
+
+    assert cache.evictions == 1
+    assert cache.get_or_compute("power", op, 2.0, 1.0)[1] is True
+    assert cache.get_or_compute("power", op, 2.0, 2.0)[1] is False
+
+
+def test_ttl_expiration():
+    cache = ResultCache(max_size=10, ttl_seconds=0.01)
+    op = CountingOperation(power)
+
+    cache.get_or_compute("power", op, 3.0, 2.0)
+    time.sleep(0.02)
+    assert cache.get_or_compute("power", op, 3.0, 2.0) == (9.0, False)
+    assert cache.expirations == 1
+    assert op.calls == 2
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache(max_size=10)
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("divide", divide, 1.0, 0.0)
+
+    assert cache.stats()["size"] == 0
+
@@ -0,0 +1,65 @@
+# tests/unit/test_streaming.py
+
+import asyncio
+
+import orjson
+
+from app.operations.streaming import MAX_LINE_BYTES, evaluate_ndjson
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def _run(chunks, batch_size=1024):
+    async def collect():
+        return [out async for out in evaluate_ndjson(chunks, batch_size)]
+
+    outputs = asyncio.run(collect())
+    lines = b"".join(outputs).splitlines()
+    return outputs, [orjson.loads(line) for line in lines]
+
+
+def test_records_split_across_chunks():
+    _, lines = _run(_chunks(
+        b'{"op": "add", "a": 1, "b": 2}\n{"op": "mul',
+        b'tiply", "a": 3, "b": 4}\n',
+        b'{"op": "power", "a": 2, "b": 10}',
+    ))
+
+    assert lines == [
+        {"index": 0, "result": 3.0},
+        {"index": 1, "result": 12.0},
+        {"index": 2, "result": 1024.0},
+    ]
+
+
+def test_bad_records_do_not_stop_the_stream():
+    _, lines = _run(_chunks(
+        b'{"op": "divide", "a": 1, "b": 0}\n'
+        b'not json\n'
+        b'\n'
+        b'{"op": "add", "a": "x", "b": 1}\n'
+        b'{"op": "subtract", "a": 5, "b": 1}\n'
+    ))
+
+    assert lines[0] == {"index": 0, "error": "Cannot divide by zero!"}
+    assert "error" in lines[1] and lines[1]["index"] == 1
+    assert lines[2]["index"] == 2 and lines[2]["error"].startswith("a:")
+    assert lines[3] == {"index": 3, "result": 4.0}
+
+
+def test_output_is_produced_in_micro_batches():
+    body = b"".join(b'{"op": "add", "a": %d, "b": 1}\n' % i for i in range(10))
+
+    outputs, lines = _run(_chunks(body), batch_size=4)
+
+    assert len(outputs) == 3
+    assert [line["result"] for line in lines] == [float(i + 1) for i in range(10)]
+
+
+def test_overlong_line_aborts():
+    _, lines = _run(_chunks(b"1" * (MAX_LINE_BYTES + 1)))
+
+    assert lines == [{"index": 0, "error": f"Line exceeds {MAX_LINE_BYTES} bytes"}]
@@ -0,0 +1,112 @@
+# tests/unit/test_vectorized.py
+
+import math
+
+import numpy as np
+import pytest
+
+from app.operations import add, subtract, multiply, divide, power
+from app.operations.vectorized import (
+    INVALID_OPERATION_MESSAGE,
+    NOT_FINITE_MESSAGE,
+    evaluate_batch,
+    range_values,
+    sweep_rows,
+)
+
+SCALAR = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+    "power": power,
+}
+
+
+@pytest.mark.parametrize("operation", list(SCALAR))
+def test_batch_matches_scalar_operations(operation):
+    a = [2.0, -3.5, 9.0, 0.5]
+    b = [3.0, 2.0, 0.5, -2.0]
+
+    batch = evaluate_batch(operation, a, b)
+
+    assert batch.errors == {}
+    expected = [SCALAR[operation](x, y) for x, y in zip(a, b)]
+    assert batch.results.tolist() == pytest.approx(expected)
+
+
+def test_mixed_operations_are_grouped_per_element():
+    batch = evaluate_batch(
+        ["add", "multiply", "power", "subtract"],
+        [1, 2, 2, 10],
+        [1, 3, 10, 4],
+    )
+
+    assert batch.errors == {}
+    assert batch.results.tolist() == [2.0, 6.0, 1024.0, 6.0]
+
+
+def test_divide_by_zero_is_reported_per_element():
+    batch = evaluate_batch(["divide", "divide", "add"], [6, 1, 1], [3, 0, 1])
+
+    results, errors = batch.to_lists()
+
+    assert results == [2.0, None, 2.0]
+    assert errors == [{"index": 1, "error": "Cannot divide by zero!"}]
+
+
+def test_power_flags_non_finite_results():
+    batch = evaluate_batch("power", [0, -8, 10, 2], [-1, 0.5, 400, 2])
+
+    assert batch.errors == {0: NOT_FINITE_MESSAGE, 1: NOT_FINITE_MESSAGE, 2: NOT_FINITE_MESSAGE}
+    assert batch.results[3] == 4.0
+
+
+@pytest.mark.parametrize(
+    "operation, a, b",
+    [
+        ("add", 1.7e308, 1.7e308),
+        ("subtract", -1.7e308, 1.7e308),
+        ("multiply", 1e308, 10),
+        ("divide", 1e308, 1e-10),
+    ],
+)
+def test_overflow_is_flagged_for_every_operation(operation, a, b, recwarn):
+    results, errors = evaluate_batch(operation, [a, 2.0], [b, 1.0]).to_lists()
+
+    assert results[0] is None
+    assert errors == [{"index": 0, "error": NOT_FINITE_MESSAGE}]
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
+
+
+def test_unknown_operation_is_reported_per_element():
+    batch = evaluate_batch(["add", "modulo"], [1, 1], [2, 2])
+
+    assert batch.errors == {1: INVALID_OPERATION_MESSAGE}
+    assert batch.results[0] == 3.0
+    assert math.isnan(batch.results[1])
+
+
+def test_length_mismatch_raises():
+    with pytest.raises(ValueError):
+        evaluate_batch(["add"], [1, 2], [1, 2])
+    with pytest.raises(ValueError):
+        evaluate_batch("add", np.ones(3), np.ones(2))
+
+
+def test_range_values_excludes_stop():
+    assert range_values(0, 1, 0.25).tolist() == [0.0, 0.25, 0.5, 0.75]
+    assert range_values(3, 0, -1).tolist() == [3.0, 2.0, 1.0]
+
+
+def test_sweep_rows_covers_the_grid_in_blocks():
+    a = np.arange(5, dtype=np.float64)
+    b = np.array([0.0, 1.0, 2.0])
+
+    blocks = list(sweep_rows("divide", a, b, rows_per_chunk=2))
+
+    assert [values.shape for values, _ in blocks] == [(2, 3), (2, 3), (1, 3)]
+    values = np.vstack([v for v, _ in blocks])
+    failed = np.vstack([f for _, f in blocks])
+    assert failed[:, 0].all() and not failed[:, 1:].any()
+    assert values[4].tolist()[1:] == [4.0, 2.0]